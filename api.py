@@ -0,0 +1,411 @@
+"""
+HTTP API for the translation pipeline.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+    POST /jobs                      multipart (file=<video>, language=French)
+                                    or JSON {"url": "...", "language": "French"};
+                                    optional quality=fast|balanced|accurate and
+                                    ocr=true (also translate the on-screen text)
+    GET  /jobs/{job_id}             job status
+    GET  /jobs/{job_id}/{artifact}  srt, original.srt, vtt, ttml, ass, json, mp4 or, for jobs
+                                    submitted with ocr=true, onscreen.srt and onscreen.vtt;
+                                    with profile=true, profile.prof, profile.folded and
+                                    profile.json
+    GET  /metrics                   Prometheus metrics (/metrics.json: JSON snapshot)
+
+Uploads are parsed incrementally and written straight into the job
+directory, so request bodies are never held in memory. Jobs run on a
+bounded worker pool; the event loop only handles I/O. Jobs are checkpointed
+(see jobs.py) and unfinished ones are resumed when the service restarts.
+Finished outputs are moved to the shared artifact store (see artifacts.py),
+which deduplicates identical files and expires them after a TTL.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse
+from multipart.multipart import MultipartParser, parse_options_header
+
+import artifacts
+import jobs
+import metrics
+import pipeline
+import quality
+import workspace
+
+JOBS_DIR = os.getenv("JOBS_DIR", "jobs")
+# Uploads and intermediates of unfinished jobs; the same rules as app workspaces by default
+JOBS_QUOTA_BYTES = int(os.getenv("JOBS_QUOTA_BYTES", str(workspace.SCRATCH_QUOTA_BYTES)))
+# Finished jobs keep job.json, which download links need, until their artifacts expire
+JOB_RETENTION_SECONDS = max(workspace.STALE_SECONDS, artifacts.ARTIFACT_TTL_SECONDS)
+API_WORKERS = int(os.getenv("API_WORKERS", "4"))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(2 * 1024 ** 3)))
+ALLOWED_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+ARTIFACTS = {
+    "srt": ("translated_subtitles", "application/x-subrip"),
+    "original.srt": ("original_subtitles", "application/x-subrip"),
+    "vtt": ("vtt", "text/vtt"),
+    "ttml": ("ttml", "application/ttml+xml"),
+    "ass": ("ass", "text/x-ssa"),
+    "json": ("subtitles_json", "application/json"),
+    "onscreen.srt": ("onscreen_subtitles", "application/x-subrip"),
+    "onscreen.vtt": ("onscreen_vtt", "text/vtt"),
+    "mp4": ("video", "video/mp4"),
+    "profile.prof": ("profile", "application/octet-stream"),
+    "profile.folded": ("flamegraph", "text/plain"),
+    "profile.json": ("profile_summary", "application/json"),
+}
+
+
+class StreamingFormParser:
+    """
+    Incremental multipart/form-data parser. File parts are written to
+    upload_dir as they arrive; text fields are kept in memory. write() and
+    close() do blocking disk I/O, so async callers run them in a thread.
+    """
+
+    def __init__(self, content_type, upload_dir, max_bytes=MAX_UPLOAD_BYTES):
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise HTTPException(status_code=400, detail="Missing multipart boundary")
+
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.fields = {}
+        self.files = {}
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = None
+        self._file = None
+        self._value = bytearray()
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def write(self, chunk):
+        self.received += len(chunk)
+        metrics.TRANSFER_BYTES.inc(len(chunk), direction="in", channel="api_upload")
+        if self.received > self.max_bytes:
+            raise HTTPException(status_code=413, detail="Upload too large")
+        self._parser.write(chunk)
+
+    def close(self):
+        try:
+            self._parser.finalize()
+        finally:
+            self.close_file()
+
+    def close_file(self):
+        """Close the file being written, if any (also after a failed write)."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._name = None
+        self._file = None
+        self._value = bytearray()
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        if filename is not None:
+            extension = os.path.splitext(filename.decode("utf-8", "replace"))[1].lower()
+            if extension not in ALLOWED_EXTENSIONS:
+                raise HTTPException(status_code=415, detail=f"Unsupported file type: {extension or 'none'}")
+            path = os.path.join(self.upload_dir, f"upload{extension}")
+            self._file = open(path, "wb")
+            self.files[self._name] = path
+
+    def _on_part_data(self, data, start, end):
+        if self._file:
+            self._file.write(data[start:end])
+        else:
+            self._value += data[start:end]
+
+    def _on_part_end(self):
+        if self._file:
+            self.close_file()
+        elif self._name:
+            self.fields[self._name] = self._value.decode("utf-8", "replace")
+
+
+class JobManager:
+    """
+    Creates job directories, runs jobs on a worker pool and keeps their
+    status in memory and in <job_dir>/job.json. Once a job succeeds only
+    job.json is kept; failed jobs keep their checkpoints. The janitor
+    removes job directories idle for longer than JOB_RETENTION_SECONDS
+    unless the job is still pending.
+    """
+
+    def __init__(self, jobs_dir=JOBS_DIR, max_workers=API_WORKERS):
+        self.jobs_dir = jobs_dir
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.records = {}
+        self._lock = threading.Lock()
+        os.makedirs(jobs_dir, exist_ok=True)
+        workspace.start_janitor(jobs_dir, max_age=JOB_RETENTION_SECONDS, prefix="", in_use=self.is_pending)
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def create(self):
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.job_dir(job_id))
+        return job_id
+
+    def is_pending(self, job_id):
+        """Whether the job is queued or running (its directory must be kept)."""
+        job = self.get(job_id)
+        return bool(job) and job.get("status") in ("queued", "running")
+
+    def ensure_capacity(self, needed_bytes=0):
+        """Raise workspace.QuotaExceeded if the jobs directory can't take needed_bytes more."""
+        workspace.ensure_capacity(needed_bytes, self.jobs_dir, JOBS_QUOTA_BYTES, max_age=JOB_RETENTION_SECONDS,
+                                  prefix="", in_use=self.is_pending)
+
+    def get(self, job_id):
+        if not JOB_ID_RE.match(job_id):
+            return None
+        with self._lock:
+            if job_id in self.records:
+                return dict(self.records[job_id])
+        path = os.path.join(self.job_dir(job_id), "job.json")
+        if not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def update(self, job_id, **changes):
+        with self._lock:
+            job = self.records.setdefault(job_id, {"id": job_id, "created": time.time()})
+            job.update(changes, updated=time.time())
+            snapshot = dict(job)
+            statuses = [record.get("status") for record in self.records.values()]
+        for status in ("queued", "running", "done", "failed"):
+            metrics.JOBS.set(statuses.count(status), status=status)
+        path = os.path.join(self.job_dir(job_id), "job.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def submit(self, job_id, language, video_path=None, url=None, burn=True, profile=False, quality_tier=None,
+               ocr_text=False):
+        self.update(job_id, status="queued", language=language, source=url or "upload",
+                    video_path=video_path, url=url, burn=burn, profile=profile, quality=quality_tier,
+                    ocr=ocr_text)
+        self.executor.submit(self._run, job_id)
+
+    def resume_pending(self):
+        """
+        Resubmit jobs that were queued or running when the process stopped.
+        Their checkpoints let them continue from the last completed step.
+        """
+        for job_id in sorted(os.listdir(self.jobs_dir)):
+            job = self.get(job_id)
+            if job and job.get("status") in ("queued", "running"):
+                with self._lock:
+                    self.records[job_id] = job
+                self.update(job_id, status="queued", resumed=job.get("resumed", 0) + 1)
+                self.executor.submit(self._run, job_id)
+
+    def _publish(self, job_id, outputs):
+        """Move output files into the artifact store; outputs then hold artifact names."""
+        store = artifacts.store()
+        published = dict(outputs)
+        for key, _ in ARTIFACTS.values():
+            path = outputs.get(key)
+            if path and os.path.isfile(path):
+                store.publish(job_id, path)
+                published[key] = os.path.basename(path)
+                os.unlink(path)
+        return published
+
+    def _run(self, job_id):
+        job = self.get(job_id)
+        self.update(job_id, status="running")
+        try:
+            outputs = jobs.run_job(
+                self.job_dir(job_id), job["language"],
+                video_path=job.get("video_path"), url=job.get("url"), burn=job.get("burn", True),
+                profile=job.get("profile"), ocr_text=job.get("ocr"),
+                translator=quality.translator(job.get("quality")),
+            )
+            self.update(job_id, status="done", outputs=self._publish(job_id, outputs))
+        except pipeline.PipelineError as e:
+            self.update(job_id, status="failed", error=str(e))
+        except Exception as e:
+            self.update(job_id, status="failed", error=f"{type(e).__name__}: {e}")
+        else:
+            # Failed jobs keep their checkpoints so that running them again resumes
+            self._discard_intermediates(job_id)
+
+    def _discard_intermediates(self, job_id):
+        """Remove everything but job.json from a succeeded job's directory."""
+        job_dir = self.job_dir(job_id)
+        for name in os.listdir(job_dir):
+            if name == "job.json":
+                continue
+            path = os.path.join(job_dir, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+
+
+app = FastAPI(title="DeepVideoTranslator API")
+job_manager = JobManager()
+
+
+@app.on_event("startup")
+async def resume_jobs():
+    await asyncio.to_thread(job_manager.resume_pending)
+
+
+def job_response(job):
+    public = {key: value for key, value in job.items() if key != "outputs"}
+    public["artifacts"] = {
+        kind: f"/jobs/{job['id']}/{kind}"
+        for kind, (key, _) in ARTIFACTS.items()
+        if key in job.get("outputs", {})
+    }
+    return public
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: Request):
+    content_type = request.headers.get("content-type", "")
+    try:
+        await asyncio.to_thread(job_manager.ensure_capacity, int(request.headers.get("content-length") or 0))
+    except workspace.QuotaExceeded as e:
+        raise HTTPException(status_code=507, detail=str(e))
+    job_id = job_manager.create()
+    try:
+        return await _accept_job(request, content_type, job_id)
+    except BaseException:
+        shutil.rmtree(job_manager.job_dir(job_id), ignore_errors=True)
+        raise
+
+
+async def _accept_job(request, content_type, job_id):
+    if content_type.startswith("application/json"):
+        body = await request.json()
+        url, language, burn = body.get("url"), body.get("language"), body.get("burn", True)
+        profile = bool(body.get("profile", False))
+        quality_tier = body.get("quality")
+        ocr_text = bool(body.get("ocr", False))
+        video_path = None
+        if not url:
+            raise HTTPException(status_code=400, detail="Missing 'url'")
+    elif content_type.startswith("multipart/form-data"):
+        parser = StreamingFormParser(content_type, job_manager.job_dir(job_id))
+        try:
+            # Disk writes run off the event loop, so a slow disk doesn't stall other requests
+            async for chunk in request.stream():
+                await asyncio.to_thread(parser.write, chunk)
+            await asyncio.to_thread(parser.close)
+        finally:
+            parser.close_file()
+        url = parser.fields.get("url")
+        language = parser.fields.get("language")
+        burn = parser.fields.get("burn", "true").lower() not in ("0", "false", "no")
+        profile = parser.fields.get("profile", "false").lower() in ("1", "true", "yes")
+        quality_tier = parser.fields.get("quality")
+        ocr_text = parser.fields.get("ocr", "false").lower() in ("1", "true", "yes")
+        video_path = parser.files.get("file")
+        if not video_path and not url:
+            raise HTTPException(status_code=400, detail="Provide a 'file' part or a 'url' field")
+    else:
+        raise HTTPException(status_code=415, detail="Use multipart/form-data or application/json")
+
+    if not language:
+        raise HTTPException(status_code=400, detail="Missing 'language'")
+    if quality_tier:
+        try:
+            quality.get_tier(quality_tier)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    job_manager.submit(job_id, language, video_path=video_path, url=url, burn=burn, profile=profile,
+                       quality_tier=quality_tier, ocr_text=ocr_text)
+    return job_response(job_manager.get(job_id))
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render_prometheus(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/metrics.json")
+async def metrics_snapshot():
+    return metrics.REGISTRY.snapshot()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
+
+
+@app.get("/jobs/{job_id}/{artifact}")
+async def get_artifact(job_id: str, artifact: str):
+    if artifact not in ARTIFACTS:
+        raise HTTPException(status_code=404, detail="Unknown artifact")
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    key, media_type = ARTIFACTS[artifact]
+    name = job.get("outputs", {}).get(key)
+    path = artifacts.store().path(job_id, name) if name else None
+    if not path:
+        raise HTTPException(status_code=409 if job.get("status") != "done" else 404,
+                            detail=f"Artifact not available (job status: {job.get('status')})")
+    metrics.TRANSFER_BYTES.inc(os.path.getsize(path), direction="out", channel="api_download")
+    # Stored files are named by their content hash
+    return FileResponse(path, media_type=media_type, filename=f"{job_id}.{artifact}",
+                        headers={"ETag": f'"{os.path.basename(path)}"'})
@@ -0,0 +1,199 @@
+"""
+Content-addressed store for job outputs (subtitles, rendered videos).
+
+    store = ArtifactStore()
+    job_id = new_job_id()
+    store.publish(job_id, "/scratch/ws-x/talk_french.srt", name="talk_french.srt")
+    path = store.path(job_id, "talk_french.srt")
+
+File contents live once under blobs/<sha256[:2]>/<sha256>, whatever job
+produced them, and each job has an index (jobs/<job_id>.json) mapping its
+artifact names to blob hashes. Blobs and indexes are written to a temporary
+file and renamed into place, so readers never see partial outputs. Jobs
+expire after a TTL; blobs no longer referenced by any job are then deleted.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import metrics
+import resources
+
+ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", os.path.join(tempfile.gettempdir(), "deepvideotranslator-artifacts"))
+ARTIFACT_TTL_SECONDS = int(os.getenv("ARTIFACT_TTL_SECONDS", str(24 * 3600)))
+EXPIRY_INTERVAL_SECONDS = int(os.getenv("ARTIFACT_EXPIRY_INTERVAL", "900"))
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    """
+    Deduplicated, expiring storage of job outputs keyed by job ID and name.
+    """
+
+    def __init__(self, root=ARTIFACTS_DIR, ttl=ARTIFACT_TTL_SECONDS):
+        self.root = root
+        self.ttl = ttl
+        self.blobs_dir = os.path.join(root, "blobs")
+        self.jobs_dir = os.path.join(root, "jobs")
+        self._lock = threading.Lock()
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def blob_path(self, digest):
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def _index_path(self, job_id):
+        if not JOB_ID_RE.match(job_id):
+            raise ValueError(f"Invalid job id: {job_id}")
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _read_index(self, job_id):
+        try:
+            with open(self._index_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _store_blob(self, source):
+        """
+        Copy bytes or a file into the blob directory and return its hash.
+        Identical content is stored once.
+        """
+        if isinstance(source, (bytes, bytearray)):
+            digest = hashlib.sha256(source).hexdigest()
+        else:
+            digest = file_sha256(source)
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            metrics.CACHE_REQUESTS.inc(cache="artifact_blobs", result="hit")
+            os.utime(path)
+            return digest
+        metrics.CACHE_REQUESTS.inc(cache="artifact_blobs", result="miss")
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".blob-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(source, (bytes, bytearray)):
+                    f.write(source)
+                else:
+                    with open(source, "rb") as src:
+                        shutil.copyfileobj(src, f, HASH_CHUNK_BYTES)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def publish(self, job_id, source, name=None):
+        """
+        Store source (a file path or bytes) as the artifact `name` of job_id
+        and return the path of the stored, read-only copy.
+        """
+        name = os.path.basename(name or source)
+        digest = self._store_blob(source)
+        with self._lock:
+            index = self._read_index(job_id) or {"created": time.time(), "artifacts": {}}
+            index["artifacts"][name] = {
+                "sha256": digest,
+                "size": os.path.getsize(self.blob_path(digest)),
+            }
+            index["expires"] = time.time() + self.ttl
+            _write_json(self._index_path(job_id), index)
+        return self.blob_path(digest)
+
+    def artifacts(self, job_id):
+        """Mapping of artifact name to {"sha256", "size"} for a live job."""
+        index = self._read_index(job_id)
+        if index is None or index["expires"] < time.time():
+            return {}
+        return index["artifacts"]
+
+    def path(self, job_id, name):
+        """Stored path of a job's artifact, or None if unknown or expired."""
+        entry = self.artifacts(job_id).get(name)
+        if entry is None:
+            return None
+        path = self.blob_path(entry["sha256"])
+        return path if os.path.exists(path) else None
+
+    def expire(self, now=None):
+        """
+        Drop expired jobs, then delete blobs no job references anymore.
+        Returns the number of blobs removed.
+        """
+        now = now or time.time()
+        referenced = set()
+        with self._lock:
+            for file_name in os.listdir(self.jobs_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                index_path = os.path.join(self.jobs_dir, file_name)
+                try:
+                    with open(index_path, encoding="utf-8") as f:
+                        index = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if index["expires"] < now:
+                    os.unlink(index_path)
+                else:
+                    referenced.update(entry["sha256"] for entry in index["artifacts"].values())
+
+            removed = 0
+            for root, _dirs, files in os.walk(self.blobs_dir):
+                for file_name in files:
+                    path = os.path.join(root, file_name)
+                    # Leave in-flight temporary files and fresh blobs whose index isn't written yet
+                    if file_name in referenced or file_name.startswith(".blob-"):
+                        continue
+                    try:
+                        if os.stat(path).st_mtime < now - 60:
+                            os.unlink(path)
+                            removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+
+@resources.resource
+def store(root=ARTIFACTS_DIR, ttl=ARTIFACT_TTL_SECONDS, interval=EXPIRY_INTERVAL_SECONDS):
+    """
+    Process-wide ArtifactStore, with a background thread expiring old jobs.
+    """
+    artifact_store = ArtifactStore(root, ttl)
+
+    def run():
+        while True:
+            artifact_store.expire()
+            time.sleep(interval)
+
+    threading.Thread(target=run, name="artifact-expiry", daemon=True).start()
+    return artifact_store
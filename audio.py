@@ -0,0 +1,245 @@
+"""
+Audio encoding policy and preprocessing before transcription.
+
+Speech recognition needs far less than music-grade audio. ``encoding_for``
+picks the codec, bitrate and sample rate for the transcription backend, so
+uploads and inline payloads stay small:
+
+    encoding = encoding_for("gemini")         # 16 kHz mono Opus, 24 kbit/s
+    pipeline.extract_audio_from_video(video, f"audio{encoding.extension}", encoding.ffmpeg_args())
+
+Long silences cost money (AssemblyAI bills per audio second, Gemini per
+audio token) and add upload time without adding words. ``trim_silence``
+finds the non-speech regions with a NumPy energy detector, writes a shorter
+file that contains only the speech, and returns a ``TimeMap`` that converts
+timestamps on the trimmed audio back to the original video timeline:
+
+    time_map = trim_silence("audio.mp3", "speech.mp3")
+    transcript = pipeline.transcribe_audio("speech.mp3")
+    segments = time_map.remap_segments(transcript.timed_segments(time_map.trimmed_duration))
+"""
+import bisect
+import os
+import subprocess
+import time
+
+import metrics
+import pipeline
+import profiling
+
+TRIM_SILENCE = os.getenv("TRIM_SILENCE", "1").lower() not in ("0", "false", "no")
+AUDIO_SPEED = float(os.getenv("AUDIO_SPEED", "1.0"))
+ANALYSIS_SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+MIN_SILENCE_SECONDS = float(os.getenv("MIN_SILENCE_SECONDS", "0.8"))
+SPEECH_PADDING_SECONDS = 0.2
+# Frames this far above the noise floor count as speech
+SPEECH_MARGIN_DB = 12.0
+SILENCE_FLOOR_DB = -60.0
+READ_BYTES = 1 << 20
+
+
+class AudioEncoding:
+    """
+    Codec, bitrate and sample rate of the audio sent to a backend.
+    """
+
+    def __init__(self, name, extension, mime_type, codec_args, sample_rate=16000):
+        self.name = name
+        self.extension = extension
+        self.mime_type = mime_type
+        self.codec_args = list(codec_args)
+        self.sample_rate = sample_rate
+
+    def ffmpeg_args(self):
+        """ffmpeg output options producing mono audio in this encoding."""
+        return [*self.codec_args, "-ar", str(self.sample_rate), "-ac", "1"]
+
+
+ENCODINGS = {
+    # Opus is tuned for speech; 24 kbit/s at 16 kHz is ~180 kB per minute
+    "opus": AudioEncoding("opus", ".ogg", "audio/ogg", ["-c:a", "libopus", "-b:a", "24k", "-application", "voip"]),
+    "opus_hq": AudioEncoding("opus_hq", ".ogg", "audio/ogg", ["-c:a", "libopus", "-b:a", "48k"]),
+    # Lossless for when accuracy matters more than size (noisy audio, local models)
+    "flac": AudioEncoding("flac", ".flac", "audio/flac", ["-c:a", "flac", "-compression_level", "8"]),
+    "mp3": AudioEncoding("mp3", ".mp3", "audio/mpeg", ["-c:a", "libmp3lame", "-q:a", "2"], sample_rate=44100),
+}
+
+BACKEND_ENCODINGS = {
+    "gemini": "opus",
+    "assemblyai": "opus_hq",
+    # faster-whisper decodes to 16 kHz PCM itself; don't add compression artifacts
+    "local": "flac",
+}
+
+
+def encoding_for(backend=None, accurate=False):
+    """
+    Encoding for a transcription backend (default: TRANSCRIBER_BACKEND).
+    AUDIO_ENCODING overrides the choice; `accurate` asks for lossless audio.
+    """
+    override = os.getenv("AUDIO_ENCODING")
+    if override:
+        return ENCODINGS[override]
+    if accurate:
+        return ENCODINGS["flac"]
+    backend = backend or os.getenv("TRANSCRIBER_BACKEND", "gemini")
+    return ENCODINGS[BACKEND_ENCODINGS.get(backend, "mp3")]
+
+
+class TimeMap:
+    """
+    Piecewise-linear map from the trimmed timeline back to the original.
+    `regions` are the kept (start, end) intervals of the original audio, in
+    order; `speed` is the tempo factor applied after trimming.
+    """
+
+    def __init__(self, regions, speed=1.0):
+        self.regions = [(float(start), float(end)) for start, end in regions]
+        self.speed = speed
+        self._trimmed_starts = []
+        position = 0.0
+        for start, end in self.regions:
+            self._trimmed_starts.append(position)
+            position += end - start
+        self.kept_seconds = position
+
+    @property
+    def trimmed_duration(self):
+        return self.kept_seconds / self.speed
+
+    def to_original(self, seconds):
+        """Original time of a timestamp on the trimmed (and sped-up) audio."""
+        if not self.regions:
+            return seconds
+        position = min(max(seconds * self.speed, 0.0), self.kept_seconds)
+        index = max(0, bisect.bisect_right(self._trimmed_starts, position) - 1)
+        start, end = self.regions[index]
+        return min(start + position - self._trimmed_starts[index], end)
+
+    def remap_segments(self, segments):
+        """(start, end, text) segments on the trimmed audio -> original timeline."""
+        return [(self.to_original(start), self.to_original(end), text) for start, end, text in segments]
+
+    def to_dict(self):
+        return {"regions": self.regions, "speed": self.speed}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["regions"], data.get("speed", 1.0))
+
+    @classmethod
+    def identity(cls, duration):
+        return cls([(0.0, duration)])
+
+
+def frame_energies(audio_path, frame_seconds=FRAME_SECONDS, sample_rate=ANALYSIS_SAMPLE_RATE):
+    """
+    RMS level in dBFS of consecutive frames of the audio. ffmpeg decodes to
+    16 kHz mono PCM, which is read in blocks so memory stays bounded no
+    matter how long the audio is.
+    """
+    import numpy as np
+
+    frame_samples = int(frame_seconds * sample_rate)
+    command = ["ffmpeg", "-v", "error", "-i", audio_path,
+               "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"]
+    levels = []
+    remainder = np.empty(0, dtype=np.int16)
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            block = process.stdout.read(READ_BYTES)
+            if not block:
+                break
+            samples = np.concatenate([remainder, np.frombuffer(block[:len(block) - len(block) % 2], dtype=np.int16)])
+            usable = len(samples) - len(samples) % frame_samples
+            frames = samples[:usable].reshape(-1, frame_samples).astype(np.float32) / 32768.0
+            levels.append(np.sqrt(np.mean(frames * frames, axis=1)))
+            remainder = samples[usable:]
+        stderr = process.stderr.read()
+    finally:
+        returncode = process.wait()
+        profiling.record_command(command, time.perf_counter() - start, returncode)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+
+    rms = np.concatenate(levels) if levels else np.empty(0, dtype=np.float32)
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_regions(levels_db, frame_seconds=FRAME_SECONDS, min_silence=MIN_SILENCE_SECONDS,
+                   padding=SPEECH_PADDING_SECONDS, margin_db=SPEECH_MARGIN_DB):
+    """
+    (start, end) seconds of the regions to keep. A frame is speech when it
+    is `margin_db` above the noise floor (10th percentile level); silences
+    shorter than `min_silence` are kept, and every region is padded so word
+    onsets and endings aren't clipped.
+    """
+    import numpy as np
+
+    if len(levels_db) == 0:
+        return []
+    threshold = max(np.percentile(levels_db, 10) + margin_db, SILENCE_FLOOR_DB)
+    speech = np.concatenate([[False], levels_db > threshold, [False]])
+    edges = np.flatnonzero(np.diff(speech.astype(np.int8)))
+    starts, ends = edges[0::2] * frame_seconds, edges[1::2] * frame_seconds
+
+    duration = len(levels_db) * frame_seconds
+    regions = []
+    for start, end in zip(starts, ends):
+        start, end = max(0.0, start - padding), min(duration, end + padding)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((float(start), float(end)))
+    return regions
+
+
+def _select_filter(regions, speed):
+    selection = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in regions)
+    audio_filter = f"aselect='{selection}',asetpts=N/SR/TB"
+    if speed != 1.0:
+        audio_filter += f",atempo={speed}"
+    return audio_filter
+
+
+@metrics.timed("trim_silence")
+def trim_silence(audio_path, output_path, speed=AUDIO_SPEED, min_saving=0.05, encoding=None):
+    """
+    Write the speech-only (optionally sped-up) version of audio_path to
+    output_path, re-encoded with `encoding` (default: MP3), and return its
+    TimeMap. When less than `min_saving` of the audio would be removed, the
+    file is copied unchanged.
+    """
+    try:
+        levels_db = frame_energies(audio_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise pipeline.PipelineError(f"Error analysing audio: {e}") from e
+    duration = len(levels_db) * FRAME_SECONDS
+    regions = speech_regions(levels_db)
+    time_map = TimeMap(regions, speed)
+    if not regions or (time_map.kept_seconds > duration * (1 - min_saving) and speed == 1.0):
+        time_map = TimeMap.identity(duration)
+        command = ["ffmpeg", "-y", "-i", audio_path, "-c", "copy", output_path]
+    else:
+        # Thousands of regions don't fit on a command line; pass the filter as a script
+        script_path = f"{output_path}.filter.txt"
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(_select_filter(regions, speed))
+        command = [
+            "ffmpeg", "-y", "-i", audio_path,
+            "-filter_script:a", script_path,
+            *(encoding or ENCODINGS["mp3"]).ffmpeg_args(),
+            output_path,
+        ]
+    try:
+        pipeline.run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise pipeline.PipelineError(f"Error trimming silence: {e.stderr.decode(errors='replace')}") from e
+    finally:
+        if "-filter_script:a" in command:
+            os.unlink(script_path)
+    metrics.AUDIO_SECONDS.inc(duration - time_map.kept_seconds, kind="silence_removed")
+    return time_map
@@ -0,0 +1,197 @@
+"""
+Headless batch runner for the translation pipeline.
+
+Processes video files, folders of videos, and video/playlist URLs without a
+browser in the loop:
+
+    python batch.py videos/ https://www.youtube.com/playlist?list=... \\
+        --language French --output-dir out --jobs 4
+
+Progress is recorded in a state file inside the output directory after each
+item, and each item checkpoints its own stages under <output-dir>/.jobs, so
+an interrupted run picks up where it stopped (down to the last transcribed
+chunk or translated batch) when re-run with the same arguments. A JSON
+throughput summary is written at the end.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import jobs
+import pipeline
+import quality
+from glossary import load_glossary
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
+
+
+class BatchState:
+    """
+    Per-item results persisted as JSON, rewritten atomically after each update.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.items = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.items = json.load(f).get("items", {})
+
+    def is_done(self, key):
+        return self.items.get(key, {}).get("status") == "done"
+
+    def update(self, key, record):
+        with self._lock:
+            self.items[key] = record
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"items": self.items}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def is_url(value):
+    return value.startswith(("http://", "https://"))
+
+
+def collect_inputs(sources, urls_file=None):
+    """
+    Expand the command-line sources into a list of files and video URLs.
+    """
+    items = []
+    if urls_file:
+        with open(urls_file, encoding="utf-8") as f:
+            sources = list(sources) + [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    for source in sources:
+        if is_url(source):
+            items.extend(pipeline.expand_urls(source))
+        elif os.path.isdir(source):
+            for root, _dirs, files in os.walk(source):
+                for file_name in sorted(files):
+                    if os.path.splitext(file_name)[1].lower() in VIDEO_EXTENSIONS:
+                        items.append(os.path.join(root, file_name))
+        elif os.path.isfile(source):
+            items.append(source)
+        else:
+            print(f"Skipping missing input: {source}", file=sys.stderr)
+
+    # Keep the first occurrence of each input
+    return list(dict.fromkeys(items))
+
+
+def job_dir_for(item, target_language, output_dir):
+    """Checkpoint directory of one input, stable across runs."""
+    key = hashlib.sha1(f"{item}\0{target_language}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(output_dir, ".jobs", key)
+
+
+def process_item(item, target_language, output_dir, burn, profile=False, glossary=None, quality_tier=None,
+                 ocr_text=None):
+    """
+    Run (or resume) the pipeline on one file or URL and return its state record.
+    """
+    start = time.perf_counter()
+    record = {"input": item, "status": "failed"}
+    job_dir = job_dir_for(item, target_language, output_dir)
+    translate_options = {"glossary": glossary} if glossary is not None else None
+    # Without --quality, quality.translator uses the QUALITY_TIER tier
+    translator = quality.translator(quality_tier)
+    try:
+        if is_url(item):
+            outputs = jobs.run_job(job_dir, target_language, url=item, output_dir=output_dir,
+                                   name=f"url_{os.path.basename(job_dir)}", burn=burn, profile=profile,
+                                   translator=translator, translate_options=translate_options, ocr_text=ocr_text)
+            record["title"] = jobs.JobManifest(job_dir).stage("download")["title"]
+        else:
+            # Files with the same name from different folders share output_dir
+            name = f"{os.path.splitext(os.path.basename(item))[0]}_{os.path.basename(job_dir)}"
+            outputs = jobs.run_job(job_dir, target_language, video_path=item, output_dir=output_dir,
+                                   name=name, burn=burn, profile=profile,
+                                   translator=translator, translate_options=translate_options, ocr_text=ocr_text)
+        record.update(outputs)
+        record["status"] = "done"
+    except pipeline.PipelineError as e:
+        record["error"] = str(e)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def summarize(state, keys, wall_seconds):
+    """
+    Throughput summary for the items of this run.
+    """
+    records = [state.items[key] for key in keys if key in state.items]
+    done = [r for r in records if r["status"] == "done"]
+    media_seconds = sum(r.get("duration", 0) for r in done)
+    return {
+        "total": len(keys),
+        "done": len(done),
+        "failed": sum(1 for r in records if r["status"] == "failed"),
+        "wall_seconds": round(wall_seconds, 3),
+        "media_seconds": round(media_seconds, 3),
+        "realtime_factor": round(media_seconds / wall_seconds, 3) if wall_seconds else None,
+        "files_per_hour": round(len(done) * 3600 / wall_seconds, 2) if wall_seconds else None,
+        "failures": {r["input"]: r.get("error") for r in records if r["status"] == "failed"},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe, translate and subtitle videos in batch.")
+    parser.add_argument("sources", nargs="*", help="Video files, folders, video or playlist URLs")
+    parser.add_argument("--urls-file", help="Text file with one URL or path per line")
+    parser.add_argument("--language", required=True, help="Target language, e.g. French")
+    parser.add_argument("--output-dir", default="batch_output")
+    parser.add_argument("--jobs", type=int, default=2, help="Number of videos processed in parallel")
+    parser.add_argument("--no-burn", action="store_true", help="Only write subtitle files")
+    parser.add_argument("--state", help="State file (default: <output-dir>/batch_state.json)")
+    parser.add_argument("--summary", help="Summary file (default: <output-dir>/batch_summary.json)")
+    parser.add_argument("--retry-failed", action="store_true", help="Also retry items that failed previously")
+    parser.add_argument("--profile", action="store_true", help="Save a profile next to each item's outputs")
+    parser.add_argument("--quality", choices=sorted(quality.TIERS),
+                        help="Translation quality tier (default: QUALITY_TIER, see quality.py)")
+    parser.add_argument("--glossary", help="Project glossary JSON (default: GLOSSARY_PATH, see glossary.py)")
+    parser.add_argument("--ocr", action="store_true", default=None,
+                        help="Also translate the text shown on screen (default: JOB_OCR, see jobs.py and ocr.py)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state = BatchState(args.state or os.path.join(args.output_dir, "batch_state.json"))
+
+    items = collect_inputs(args.sources, args.urls_file)
+    pending = [
+        item for item in items
+        if not state.is_done(item) and (args.retry_failed or item not in state.items)
+    ]
+    print(f"{len(items)} inputs, {len(items) - len(pending)} skipped from previous runs, {len(pending)} to run", file=sys.stderr)
+
+    glossary = load_glossary(args.glossary) if args.glossary else None
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {
+            executor.submit(process_item, item, args.language, args.output_dir, not args.no_burn, args.profile, glossary, args.quality, args.ocr): item
+            for item in pending
+        }
+        for future in as_completed(futures):
+            item = futures[future]
+            record = future.result()
+            state.update(item, record)
+            print(f"[{record['status']}] {item} ({record['seconds']}s)", file=sys.stderr)
+
+    summary = summarize(state, pending, time.perf_counter() - start)
+    summary_path = args.summary or os.path.join(args.output_dir, "batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
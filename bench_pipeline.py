@@ -0,0 +1,345 @@
+"""
+Offline end-to-end benchmark of the translation pipeline.
+
+Runs jobs.run_job on synthetic videos of increasing length (1, 10, 30 and
+120 minutes by default) and on any sample files given. The transcription
+and translation APIs are replaced by replay backends that return the
+responses recorded in bench_fixtures.json after the recorded latency, so
+runs are reproducible and free. ffmpeg/ffprobe do the real work.
+
+Each video runs in a fresh process and reports per-stage wall and CPU time
+(from the metrics registry), peak RSS of the process and of ffmpeg, and the
+peak size of the job's scratch directory. With --ocr the jobs also read the
+on-screen text, and each case reports the OCR time per second of video
+(ocr_seconds_per_media_second; OCR runs alongside transcription, so it
+only adds to the job's wall time when it takes longer).
+
+    python bench_pipeline.py --lengths 1,10 --output bench_report.json
+    python bench_pipeline.py --baseline bench_report.json       # fail on regressions
+    python bench_pipeline.py --record clip.mp4                   # refresh the fixtures
+    python bench_pipeline.py --quality fast --output fast.json   # translation tier trade-offs
+    python bench_pipeline.py --ocr --lengths 10 slides.mp4       # on-screen text cost
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jobs
+import metrics
+import pipeline
+import quality
+import tokens
+import verification
+import workspace
+from transcribers import TRANSCRIBERS, Transcriber, Transcript
+from translators import Translator
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_PATH = os.path.join(REPO_DIR, "bench_fixtures.json")
+DEFAULT_LENGTHS_MINUTES = [1, 10, 30, 120]
+WORDS_PER_SECOND = 2.5
+DISK_SAMPLE_SECONDS = 0.2
+
+
+def load_fixtures(path=FIXTURES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplayTranscriber(Transcriber):
+    """
+    Returns the recorded transcript, repeated to match the audio length,
+    after the recorded latency for that much audio.
+    """
+    name = "replay"
+
+    def __init__(self, fixture=None, latency_scale=1.0):
+        fixture = fixture or load_fixtures()["transcriber"]
+        self.words = fixture["text"].split()
+        self.latency = fixture["latency"]
+        self.latency_scale = latency_scale
+
+    def transcribe(self, audio_path):
+        # Unwrapped so the probe isn't counted as a pipeline stage
+        duration = pipeline.check_video_duration.__wrapped__(audio_path)
+        time.sleep(self.latency_scale * (self.latency["base_seconds"] + self.latency["per_audio_second"] * duration))
+        word_count = max(1, int(duration * WORDS_PER_SECOND))
+        return Transcript(" ".join(itertools.islice(itertools.cycle(self.words), word_count)))
+
+
+class ReplayTranslator(Translator):
+    """
+    Returns recorded translations (or the input when none were recorded
+    for the language) after the recorded per-batch latency. With a quality
+    tier, the texts are packed and sent concurrently as the tier's Gemini
+    translator would, each followed by its review request (the whole batch,
+    or only the lines verification.py flags).
+    """
+    name = "replay"
+
+    def __init__(self, fixture=None, latency_scale=1.0, tier=None):
+        fixture = fixture or load_fixtures()["translator"]
+        self.samples = fixture.get("samples", {})
+        self.latency = fixture["latency"]
+        self.latency_scale = latency_scale
+        self.tier = tier
+
+    def _request(self, line_count):
+        time.sleep(self.latency_scale * (self.latency["base_seconds"] + self.latency["per_segment"] * line_count))
+
+    def _replay_batch(self, texts, translations, target_language):
+        self._request(len(texts))
+        if self.tier.review == "flagged":
+            flagged = verification.flag_cues(texts, translations, target_language)
+            if flagged:
+                self._request(len(flagged))
+        elif self.tier.review:
+            self._request(len(texts))
+
+    def translate_batch(self, texts, target_language, **options):
+        samples = self.samples.get(target_language)
+        translations = [sample for sample, _ in zip(itertools.cycle(samples), texts)] if samples else list(texts)
+        if self.tier is None:
+            self._request(len(texts))
+            return translations
+        batches = tokens.pack(texts, target_language, tokens.limits_for(self.tier.model_name),
+                              max_lines=self.tier.batch_size, context_lines=self.tier.context_lines)
+        with ThreadPoolExecutor(max_workers=self.tier.concurrency) as pool:
+            list(pool.map(lambda bounds: self._replay_batch(texts[slice(*bounds)], translations[slice(*bounds)],
+                                                            target_language), batches))
+        return translations
+
+
+def synthetic_video(minutes, media_dir):
+    """Test pattern video with a tone of the given length, cached in media_dir."""
+    os.makedirs(media_dir, exist_ok=True)
+    path = os.path.join(media_dir, f"synthetic_{minutes:g}min.mp4")
+    if not os.path.exists(path):
+        seconds = str(int(minutes * 60))
+        command = [
+            "ffmpeg", "-y",
+            "-f", "lavfi", "-i", "testsrc2=size=640x360:rate=25",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100",
+            "-t", seconds,
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest",
+            f"{path}.tmp.mp4",
+        ]
+        subprocess.run(command, check=True, capture_output=True)
+        os.replace(f"{path}.tmp.mp4", path)
+    return path
+
+
+class DiskSampler:
+    """Samples the size of a directory in the background and keeps the peak."""
+
+    def __init__(self, path, interval=DISK_SAMPLE_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, workspace.disk_usage(self.path))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, workspace.disk_usage(self.path))
+        return False
+
+
+def stage_report():
+    """Per-stage totals from the metrics registry."""
+    snapshot = metrics.REGISTRY.snapshot()["metrics"]
+    stages = {}
+    for metric_name, field in (("pipeline_stage_seconds", "wall_seconds"), ("pipeline_stage_cpu_seconds", "cpu_seconds")):
+        for sample in snapshot[metric_name]["samples"]:
+            stage = stages.setdefault(sample["labels"]["stage"], {"calls": 0})
+            stage[field] = round(stage.get(field, 0) + sample["sum"], 4)
+            if field == "wall_seconds":
+                stage["calls"] += sample["count"]
+    return stages
+
+
+def _child(video_path, language, burn, latency_scale, tier_name=None, ocr_text=False):
+    """Run one job in this process and print its measurements as JSON."""
+    fixtures = load_fixtures()
+    TRANSCRIBERS[ReplayTranscriber.name] = lambda: ReplayTranscriber(fixtures["transcriber"], latency_scale)
+    tier = quality.get_tier(tier_name) if tier_name else None
+    translator = ReplayTranslator(fixtures["translator"], latency_scale, tier)
+
+    job_dir = tempfile.mkdtemp(prefix="bench-job-")
+    try:
+        start = time.perf_counter()
+        cpu_start = os.times()
+        with DiskSampler(job_dir) as disk:
+            outputs = jobs.run_job(
+                job_dir, language, video_path=video_path, burn=burn,
+                transcribe_options={"backend": ReplayTranscriber.name}, translator=translator,
+                ocr_text=ocr_text,
+            )
+        cpu_end = os.times()
+        wall = time.perf_counter() - start
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    stages = stage_report()
+    report = {
+        "media_seconds": round(outputs["duration"], 3),
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(sum(cpu_end[:4]) - sum(cpu_start[:4]), 3),
+        "realtime_factor": round(outputs["duration"] / wall, 3) if wall else None,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "peak_disk_mb": round(disk.peak / 1024 ** 2, 1),
+        "stages": stages,
+    }
+    if "ocr" in stages and outputs["duration"]:
+        report["ocr_seconds_per_media_second"] = round(stages["ocr"]["wall_seconds"] / outputs["duration"], 4)
+    print(json.dumps(report))
+
+
+def run_case(video_path, language, burn, latency_scale, tier_name=None, ocr_text=False):
+    """Benchmark one video in a fresh process."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", video_path,
+               "--language", language, "--latency-scale", str(latency_scale)]
+    if not burn:
+        command.append("--no-burn")
+    if tier_name:
+        command += ["--quality", tier_name]
+    if ocr_text:
+        command.append("--ocr")
+    result = subprocess.run(command, capture_output=True, text=True, cwd=REPO_DIR)
+    for line in reversed(result.stdout.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"}
+
+
+def compare(report, baseline, tolerance):
+    """
+    Regressions of the current report against a baseline: cases whose wall
+    time, CPU time, peak RSS, peak disk or OCR time per media second grew
+    by more than `tolerance`.
+    """
+    regressions = []
+    for case, current in report["cases"].items():
+        previous = baseline.get("cases", {}).get(case)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for key in ("wall_seconds", "cpu_seconds", "peak_rss_mb", "peak_disk_mb", "ocr_seconds_per_media_second"):
+            if previous.get(key) and current.get(key, 0) > previous[key] * (1 + tolerance):
+                regressions.append(f"{case}: {key} {previous[key]} -> {current[key]}")
+    return regressions
+
+
+def record_fixtures(clip_path, language, path=FIXTURES_PATH):
+    """
+    Replace the fixtures with real responses and latencies from the
+    configured backends on a short clip.
+    """
+    fixtures = load_fixtures(path)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = os.path.join(temp_dir, "audio.mp3")
+        pipeline.extract_audio_from_video(clip_path, audio_path)
+        duration = pipeline.check_video_duration(audio_path)
+
+        start = time.perf_counter()
+        transcript = pipeline.transcribe_audio(audio_path)
+        transcribe_seconds = time.perf_counter() - start
+
+    import resources
+    segments = transcript.timed_segments(duration)
+    texts = [text for _, _, text in segments]
+    start = time.perf_counter()
+    translations = resources.translator().translate_batch(texts, language)
+    translate_seconds = time.perf_counter() - start
+
+    fixtures["transcriber"].update(
+        backend=os.getenv("TRANSCRIBER_BACKEND", "gemini"),
+        text=transcript.text,
+        latency={"base_seconds": 0.0, "per_audio_second": round(transcribe_seconds / duration, 4)},
+    )
+    fixtures["translator"]["backend"] = os.getenv("TRANSLATOR_BACKEND", "gemini")
+    fixtures["translator"]["latency"] = {"base_seconds": 0.0, "per_segment": round(translate_seconds / max(1, len(texts)), 4)}
+    fixtures["translator"].setdefault("samples", {})[language] = translations
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, indent=2, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline offline with replayed API responses.")
+    parser.add_argument("samples", nargs="*", help="Extra sample videos to benchmark")
+    parser.add_argument("--lengths", default=",".join(map(str, DEFAULT_LENGTHS_MINUTES)),
+                        help="Comma-separated synthetic video lengths in minutes (empty for none)")
+    parser.add_argument("--media-dir", default=os.path.join(REPO_DIR, "bench_media"))
+    parser.add_argument("--language", default="French")
+    parser.add_argument("--no-burn", action="store_true", help="Skip the subtitle burn-in stage")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier for replayed API latency (0 disables it)")
+    parser.add_argument("--quality", choices=sorted(quality.TIERS),
+                        help="Simulate the batching, concurrency and review pass of a quality tier")
+    parser.add_argument("--ocr", action="store_true", help="Also read the on-screen text and report its cost")
+    parser.add_argument("--output", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Previous report; exit 1 if a case regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative growth before a regression")
+    parser.add_argument("--record", metavar="CLIP", help="Record fixtures from the real backends on CLIP and exit")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.language, not args.no_burn, args.latency_scale, args.quality, args.ocr)
+        return 0
+    if args.record:
+        record_fixtures(args.record, args.language)
+        return 0
+
+    cases = {}
+    for minutes in [float(m) for m in re.split(r"[,\s]+", args.lengths) if m]:
+        cases[f"synthetic_{minutes:g}min"] = synthetic_video(minutes, args.media_dir)
+    for sample in args.samples:
+        cases[os.path.basename(sample)] = os.path.abspath(sample)
+
+    report = {"language": args.language, "burn": not args.no_burn, "latency_scale": args.latency_scale,
+              "quality": args.quality, "ocr": args.ocr, "cases": {}}
+    for case, video_path in cases.items():
+        report["cases"][case] = run_case(video_path, args.language, not args.no_burn, args.latency_scale, args.quality,
+                                         args.ocr)
+        print(f"{case}: {json.dumps(report['cases'][case])}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
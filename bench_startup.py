@@ -0,0 +1,162 @@
+"""
+Startup and rerun latency benchmark for the Streamlit apps.
+
+For each heavy dependency it measures the import time in a fresh process.
+For each app script it measures the cold run (fresh process, first
+execution of the script body) and the warm rerun (second execution in the
+same process, which is what every Streamlit widget interaction costs).
+It also runs the app in a test session (``main()`` included) and reports
+how many bytes of markdown/HTML it sends to the browser on the first run
+and on the reruns after it, and how long each takes.
+
+    python bench_startup.py latest.py demoIlimit.py
+    python bench_startup.py --rev HEAD~1 latest.py demoIlimit.py   # before
+
+Scripts run in Streamlit "bare mode", so no server is needed.
+"""
+import argparse
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = [
+    "streamlit",
+    "google.generativeai",
+    "assemblyai",
+    "moviepy.editor",
+    "pytube",
+    "langdetect",
+    "yt_dlp",
+]
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_import(module_name):
+    """Import time of a module in a fresh interpreter, or None if missing."""
+    code = (
+        "import time, importlib; t = time.perf_counter(); "
+        f"importlib.import_module({module_name!r}); print(time.perf_counter() - t)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return round(float(result.stdout.strip().splitlines()[-1]), 4)
+
+
+def _run_script(path):
+    start = time.perf_counter()
+    try:
+        runpy.run_path(path, run_name="__bench__")
+    except (ImportError, SyntaxError):
+        raise
+    except BaseException:
+        # st.stop() and missing keys end the script early; still a valid timing
+        pass
+    return time.perf_counter() - start
+
+
+def _measure_payload(path, reruns=2):
+    """
+    Bytes of markdown/HTML (st.markdown and components.html) sent during the
+    first run of a session and during each rerun after it, and the run
+    durations. Runs in a Streamlit test session, so session state persists
+    between reruns as it does in the browser.
+    """
+    import streamlit as st
+    import streamlit.components.v1 as components
+    from streamlit.testing.v1 import AppTest
+
+    sent = []
+    original_markdown, original_html = st.markdown, components.html
+
+    def markdown(body, *args, **kwargs):
+        sent.append(len(str(body).encode("utf-8")))
+        return original_markdown(body, *args, **kwargs)
+
+    def html(body, *args, **kwargs):
+        sent.append(len(str(body).encode("utf-8")))
+        return original_html(body, *args, **kwargs)
+
+    st.markdown, components.html = markdown, html
+    runs = []
+    try:
+        app = AppTest.from_file(path, default_timeout=60)
+        for _ in range(1 + reruns):
+            sent.clear()
+            start = time.perf_counter()
+            app.run()
+            runs.append({"calls": len(sent), "bytes": sum(sent),
+                         "render_seconds": round(time.perf_counter() - start, 4)})
+    finally:
+        st.markdown, components.html = original_markdown, original_html
+    return {"first_run": runs[0], "reruns": runs[1:]}
+
+
+def _child(path):
+    sys.path.insert(0, REPO_DIR)
+    # Placeholder keys so the apps render the whole page instead of stopping
+    # at the missing-key message; nothing here calls the services
+    for key in ("ASSEMBLYAI_API_KEY", "GEMINI_API_KEY"):
+        os.environ.setdefault(key, "bench")
+    try:
+        cold = _run_script(path)
+        warm = min(_run_script(path) for _ in range(3))
+        payload = _measure_payload(path)
+    except ImportError as e:
+        print(json.dumps({"error": f"missing dependency: {e.name}"}))
+        return
+    except SyntaxError as e:
+        print(json.dumps({"error": f"syntax error: {e.msg} (line {e.lineno})"}))
+        return
+    print(json.dumps({"cold_seconds": round(cold, 4), "rerun_seconds": round(warm, 4), "payload": payload}))
+
+
+def time_script(path):
+    """Cold run and warm rerun timings of an app script in a fresh process."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path],
+        capture_output=True, text=True, cwd=REPO_DIR,
+    )
+    for line in reversed(result.stdout.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"}
+
+
+def script_at_revision(path, rev, temp_dir):
+    """Write the script as it was at a git revision into temp_dir."""
+    source = subprocess.check_output(["git", "show", f"{rev}:{path}"], cwd=REPO_DIR)
+    target = os.path.join(temp_dir, os.path.basename(path))
+    with open(target, "wb") as f:
+        f.write(source)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and rerun latency of the Streamlit apps.")
+    parser.add_argument("scripts", nargs="*", default=["latest.py", "demoIlimit.py"])
+    parser.add_argument("--rev", help="Benchmark the scripts as they were at this git revision")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    report = {"imports": {name: time_import(name) for name in HEAVY_MODULES}, "scripts": {}}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for script in args.scripts:
+            path = script_at_revision(script, args.rev, temp_dir) if args.rev else os.path.join(REPO_DIR, script)
+            report["scripts"][script] = time_script(path)
+    if args.rev:
+        report["revision"] = args.rev
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
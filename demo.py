@@ -7,6 +7,8 @@ from typing import Optional
 import google.generativeai as genai
 from datetime import timedelta
 import yt_dlp
+import audio
+import pipeline
 
 # Configure page layout
 st.set_page_config(
@@ -41,24 +43,22 @@ def extract_video_id_from_url(url: str) -> str:
     return match.group(1) if match else None
 
 def download_audio_from_youtube(url: str, temp_dir: str) -> Optional[str]:
-    """Download audio from YouTube video and save as MP3."""
+    """Download audio from YouTube video and re-encode it for Gemini (16 kHz mono Opus)."""
     try:
-        audio_path = os.path.join(temp_dir, "audio.mp3")
+        encoding = audio.encoding_for("gemini")
+        audio_path = os.path.join(temp_dir, f"audio{encoding.extension}")
         ydl_opts = {
             'format': 'bestaudio/best',
-            'outtmpl': audio_path.replace('.mp3', ''),
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
+            'outtmpl': os.path.join(temp_dir, 'source.%(ext)s'),
             'quiet': True,
             'no_warnings': True,
         }
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+            source_path = ydl.prepare_filename(ydl.extract_info(url, download=True))
         
+        pipeline.extract_audio_from_video(source_path, audio_path, encoding.ffmpeg_args())
+        os.unlink(source_path)
         return audio_path if os.path.exists(audio_path) else None
     except Exception as e:
         st.error(f"Error downloading audio: {str(e)}")
@@ -79,7 +79,7 @@ def generate_content_with_gemini_method(video_url: str, target_language: str, ge
         genai.configure(api_key=gemini_api_key)
         
         # Upload the actual audio file (NOT YouTube URL)
-        uploaded_file = genai.upload_file(path=audio_file_path)
+        uploaded_file = genai.upload_file(path=audio_file_path, mime_type=audio.encoding_for("gemini").mime_type)
         
         # Wait for processing
         while uploaded_file.state.name == "PROCESSING":
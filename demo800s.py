@@ -2,12 +2,12 @@ import streamlit as st
 import os
 import assemblyai as aai
 import google.generativeai as genai
-from tempfile import NamedTemporaryFile
 import base64
 import streamlit.components.v1 as components
 from moviepy.editor import VideoFileClip
 import random
 import langdetect
+import workspace
 
 # Set up API keys (consider using environment variables for security)
 ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
@@ -42,14 +42,11 @@ def check_video_duration(video_file):
     """
     Check if the video duration is 10 minutes or less
     """
-    with NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-        tmp_file.write(video_file.getvalue())
-        tmp_file_path = tmp_file.name
-
-    video = VideoFileClip(tmp_file_path)
-    duration = video.duration
-    video.close()
-    os.unlink(tmp_file_path)
+    with workspace.Workspace() as ws:
+        tmp_file_path = ws.write_upload(video_file, "input.mp4")
+        video = VideoFileClip(tmp_file_path)
+        duration = video.duration
+        video.close()
 
     return duration <= 800  # 600 seconds = 10 minutes
 
@@ -57,15 +54,10 @@ def transcribe_video(video_file):
     """
     Transcribe video and return subtitles as SRT
     """
-    with NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-        tmp_file.write(video_file.getvalue())
-        tmp_file_path = tmp_file.name
-
-    transcript = aai.Transcriber().transcribe(tmp_file_path)
-    subtitles = transcript.export_subtitles_srt()
-
-    os.unlink(tmp_file_path)
-    return subtitles
+    with workspace.Workspace() as ws:
+        tmp_file_path = ws.write_upload(video_file, "input.mp4")
+        transcript = aai.Transcriber().transcribe(tmp_file_path)
+        return transcript.export_subtitles_srt()
 
 def is_english(text):
     """
@@ -213,29 +205,30 @@ def main():
                         st.error("The video appears to be in a language other than English. Please upload an English video.")
                         return
 
-                    # Save original subtitles
-                    original_subtitle_file = f"{file_name}_original.srt"
-                    with open(original_subtitle_file, "w", encoding="utf-8") as f:
-                        f.write(subtitles)
+                    with workspace.Workspace() as ws:
+                        # Save original subtitles
+                        original_subtitle_file = ws.file(f"{file_name}_original.srt")
+                        with open(original_subtitle_file, "w", encoding="utf-8") as f:
+                            f.write(subtitles)
 
-                    # Translate subtitles
-                    translated_subtitles = translate_content(subtitles, LANGUAGES[target_language])
+                        # Translate subtitles
+                        translated_subtitles = translate_content(subtitles, LANGUAGES[target_language])
 
-                    # Save translated subtitles
-                    translated_subtitle_file = f"{file_name}_{target_language.lower().replace(' ', '_')}.srt"
-                    with open(translated_subtitle_file, "w", encoding="utf-8") as f:
-                        f.write(translated_subtitles)
+                        # Save translated subtitles
+                        translated_subtitle_file = ws.file(f"{file_name}_{target_language.lower().replace(' ', '_')}.srt")
+                        with open(translated_subtitle_file, "w", encoding="utf-8") as f:
+                            f.write(translated_subtitles)
 
-                    wisdom_placeholder.empty()  # Remove the wisdom messages
-                    st.success("Processing complete!")
+                        wisdom_placeholder.empty()  # Remove the wisdom messages
+                        st.success("Processing complete!")
 
-                    # Download buttons
-                    st.markdown(get_binary_file_downloader_html(original_subtitle_file, "Original Subtitles"), unsafe_allow_html=True)
-                    st.markdown(get_binary_file_downloader_html(translated_subtitle_file, f"{target_language} Subtitles"), unsafe_allow_html=True)
+                        # Download buttons
+                        st.markdown(get_binary_file_downloader_html(original_subtitle_file, "Original Subtitles"), unsafe_allow_html=True)
+                        st.markdown(get_binary_file_downloader_html(translated_subtitle_file, f"{target_language} Subtitles"), unsafe_allow_html=True)
 
-                    # Display video with subtitles
-                    st.subheader("Video Preview with Subtitles")
-                    st.video(uploaded_file, subtitles=translated_subtitle_file)
+                        # Display video with subtitles
+                        st.subheader("Video Preview with Subtitles")
+                        st.video(uploaded_file, subtitles=translated_subtitle_file)
 
                     # Instructions for offline viewing
                     st.markdown("""
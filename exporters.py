@@ -0,0 +1,51 @@
+"""
+Writing one cue list to several subtitle formats at once.
+
+    paths = export(segments, os.path.join(output_dir, "talk_french"))
+    # {"srt": ".../talk_french.srt", "vtt": ".../talk_french.vtt", ...}
+
+The cues are materialized once and every format is rendered straight from
+them (see subtitles.FORMATS), streaming into its file from its own thread.
+No format is parsed back to produce another. EXPORT_FORMATS picks the
+default formats (comma-separated, all of them unless set).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from subtitles import FORMATS
+
+EXPORT_FORMATS = [f.strip() for f in os.getenv("EXPORT_FORMATS", ",".join(FORMATS)).split(",") if f.strip()]
+
+
+def write_format(segments, path, fmt):
+    """Render segments in one format into path, atomically."""
+    _, render = FORMATS[fmt]
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for chunk in render(segments):
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+
+@metrics.timed("export")
+def export(segments, base_path, formats=None):
+    """
+    Write the segments as base_path + extension for each format and return
+    the paths by format.
+    """
+    formats = list(dict.fromkeys(formats or EXPORT_FORMATS))
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown subtitle format(s): {', '.join(unknown)}")
+    segments = list(segments)
+    paths = {fmt: f"{base_path}{FORMATS[fmt][0]}" for fmt in formats}
+    if len(formats) == 1:
+        write_format(segments, paths[formats[0]], formats[0])
+        return paths
+    with ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix="export") as pool:
+        futures = [pool.submit(write_format, segments, paths[fmt], fmt) for fmt in formats]
+        for future in futures:
+            future.result()
+    return paths
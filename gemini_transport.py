@@ -0,0 +1,116 @@
+"""
+How audio reaches Gemini: inline data or the File API.
+
+Inline data is one request with no extra round trips, but the audio is
+base64-encoded into the request body (a third larger, and the whole file in
+memory), and requests are capped at 20 MB. The File API streams the file
+from disk with a resumable upload, which costs an upload and a processing
+wait but has no practical size limit.
+
+``audio_part`` picks inline data for small files and the File API for the
+rest. Uploaded files are remembered by content hash, so retries of the same
+audio reuse the upload instead of sending it again.
+"""
+import base64
+import hashlib
+import os
+import threading
+import time
+
+import metrics
+
+# Leaves room for the base64 overhead and the prompt under the 20 MB request cap
+INLINE_MAX_BYTES = int(os.getenv("GEMINI_INLINE_MAX_BYTES", str(14 * 1024 ** 2)))
+UPLOAD_POLL_SECONDS = 1.0
+UPLOAD_TIMEOUT_SECONDS = 600
+# Gemini deletes uploaded files after 48 hours; stop reusing them well before
+UPLOAD_REUSE_SECONDS = 36 * 3600
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Content hash -> (uploaded file name, upload time)
+_uploads = {}
+# Local path -> content hash of its last upload, so release() doesn't hash the file again
+_uploaded_paths = {}
+_lock = threading.Lock()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def inline_part(path, mime_type):
+    with open(path, "rb") as f:
+        data = base64.b64encode(f.read()).decode("utf-8")
+    return {"inlineData": {"mimeType": mime_type, "data": data}}
+
+
+def _wait_until_active(genai, uploaded):
+    deadline = time.monotonic() + UPLOAD_TIMEOUT_SECONDS
+    while uploaded.state.name == "PROCESSING":
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Gemini is still processing {uploaded.name}")
+        time.sleep(UPLOAD_POLL_SECONDS)
+        uploaded = genai.get_file(uploaded.name)
+    if uploaded.state.name != "ACTIVE":
+        raise RuntimeError(f"Gemini could not process the uploaded audio ({uploaded.state.name})")
+    return uploaded
+
+
+def uploaded_file(path, mime_type):
+    """
+    The ACTIVE File API handle for the file's content, uploading it
+    (resumably, streamed from disk) only if no recent upload exists.
+    """
+    import google.generativeai as genai
+
+    digest = _file_sha256(path)
+    with _lock:
+        _uploaded_paths[path] = digest
+        cached = _uploads.get(digest)
+    if cached and time.time() - cached[1] < UPLOAD_REUSE_SECONDS:
+        try:
+            handle = genai.get_file(cached[0])
+            if handle.state.name == "ACTIVE":
+                metrics.CACHE_REQUESTS.inc(cache="gemini_uploads", result="hit")
+                return handle
+        except Exception:
+            pass
+
+    metrics.CACHE_REQUESTS.inc(cache="gemini_uploads", result="miss")
+    with metrics.timed("gemini_upload"):
+        handle = _wait_until_active(genai, genai.upload_file(path=path, mime_type=mime_type, resumable=True))
+    metrics.TRANSFER_BYTES.inc(os.path.getsize(path), direction="out", channel="gemini_upload")
+    with _lock:
+        _uploads[digest] = (handle.name, time.time())
+    return handle
+
+
+def release(path):
+    """Delete the uploaded copy of a file once it is no longer needed."""
+    import google.generativeai as genai
+
+    with _lock:
+        digest = _uploaded_paths.pop(path, None)
+        cached = _uploads.pop(digest, None) if digest else None
+    if cached:
+        try:
+            genai.delete_file(cached[0])
+        except Exception:
+            pass
+
+
+def audio_part(path, mime_type, inline_max_bytes=INLINE_MAX_BYTES):
+    """
+    Request part carrying the audio file: inline data, or the File API
+    handle (which generate_content accepts as a part). Returns (part,
+    uploaded), where `uploaded` tells whether the File API was used.
+    """
+    size = os.path.getsize(path)
+    if size <= inline_max_bytes:
+        metrics.TRANSFER_BYTES.inc(size, direction="out", channel="gemini_inline")
+        return inline_part(path, mime_type), False
+    return uploaded_file(path, mime_type), True
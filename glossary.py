@@ -0,0 +1,171 @@
+"""
+Project glossary: terms that must be translated one way (or not at all).
+
+A glossary is a JSON file (GLOSSARY_PATH, default ``glossary.json`` next to
+the code) listing terms and their required translations per language. A
+term without translations is kept unchanged in every language:
+
+    {"terms": [
+        {"term": "DeepVideoTranslator"},
+        {"term": "burn-in", "translations": {"French": "incrustation"}}
+    ]}
+
+All terms are compiled into one Aho-Corasick automaton, so finding the
+terms used in a batch of cues is a single pass over the text whatever the
+size of the glossary. Translators put only the matched terms in the prompt
+and check the translations against them afterwards:
+
+    terms = load_glossary().constraints(texts, "French")   # {"burn-in": "incrustation"}
+    bad = load_glossary().violations(texts, translations, "French")   # {3: ["burn-in"]}
+"""
+import collections
+import json
+import os
+import unicodedata
+
+import resources
+
+GLOSSARY_PATH = os.getenv(
+    "GLOSSARY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "glossary.json")
+)
+
+
+def _is_word_char(char):
+    # CJK scripts have no spaces, so a match there never needs a boundary
+    return char.isalnum() and unicodedata.east_asian_width(char) not in "WF"
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a set of terms, matched case-insensitively
+    on word boundaries.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self._goto = [{}]
+        self._fail = [0]
+        # Indices of the terms ending at each state
+        self._out = [[]]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term.lower():
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append(index)
+
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text):
+        """
+        Non-overlapping (start, end, term) matches in text, preferring the
+        leftmost and then the longest term.
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased; keep offsets aligned
+            lowered = "".join(c.lower()[0] for c in text)
+        candidates = []
+        state = 0
+        for i, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._out[state]:
+                term = self.terms[index]
+                start, end = i + 1 - len(term), i + 1
+                if start > 0 and _is_word_char(term[0]) and _is_word_char(text[start - 1]):
+                    continue
+                if end < len(text) and _is_word_char(term[-1]) and _is_word_char(text[end]):
+                    continue
+                candidates.append((start, end, term))
+
+        matches, position = [], 0
+        for start, end, term in sorted(candidates, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= position:
+                matches.append((start, end, term))
+                position = end
+        return matches
+
+
+class Glossary:
+    """
+    Terms and their required translations, with a matcher over all terms.
+    """
+
+    def __init__(self, entries=()):
+        # term -> {language: translation}; an empty dict means "keep as is"
+        self.entries = {entry["term"]: dict(entry.get("translations") or {}) for entry in entries}
+        self.matcher = TermMatcher(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("terms", []))
+
+    def required(self, term, target_language):
+        """Translation a term must have in target_language, or None if any will do."""
+        translations = self.entries[term]
+        if not translations:
+            return term
+        return translations.get(target_language)
+
+    def constraints(self, texts, target_language):
+        """{term: required translation} for the terms used in texts, in order of appearance."""
+        found = {}
+        for text in texts:
+            for _, _, term in self.matcher.find(text):
+                required = self.required(term, target_language)
+                if required is not None:
+                    found.setdefault(term, required)
+        return found
+
+    def prompt_section(self, texts, target_language):
+        """Prompt instructions for the terms used in texts ("" if none)."""
+        constraints = self.constraints(texts, target_language)
+        if not constraints:
+            return ""
+        lines = [
+            f"- {term}: keep unchanged" if required == term else f"- {term} -> {required}"
+            for term, required in constraints.items()
+        ]
+        return "Use this terminology exactly:\n" + "\n".join(lines)
+
+    def violations(self, sources, translations, target_language):
+        """
+        {index: [terms]} of the translations that don't contain the required
+        translation of a term used in their source.
+        """
+        bad = {}
+        for i, (source, translation) in enumerate(zip(sources, translations)):
+            lowered = translation.lower()
+            missing = [term for term, required in self.constraints([source], target_language).items()
+                       if required.lower() not in lowered]
+            if missing:
+                bad[i] = missing
+        return bad
+
+
+@resources.resource
+def load_glossary(path=None):
+    """The glossary at path (default GLOSSARY_PATH); empty if there is no file."""
+    path = path or GLOSSARY_PATH
+    if not os.path.exists(path):
+        return Glossary()
+    return Glossary.from_file(path)
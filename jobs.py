@@ -0,0 +1,297 @@
+"""
+Checkpointed, resumable pipeline jobs.
+
+A job works inside its own directory and records progress in
+``manifest.json`` after every completed step:
+
+    download  -> source video fetched (URL jobs only)
+    audio     -> audio extracted, silences cut out, split into chunks
+    ocr       -> on-screen text read from frames at scene changes (optional,
+                 runs while the audio is transcribed; see ocr.py)
+    chunk i   -> transcript of audio chunk i
+    batch j   -> translations of subtitle batch j (ocr_j: of the on-screen text)
+    render    -> subtitles burned into the video
+
+Running the same job again (e.g. after the worker restarted) skips every
+completed step, so paid transcription and translation calls are never
+repeated.
+"""
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import audio
+import exporters
+import metrics
+import ocr
+import pipeline
+import profiling
+import quality
+import render
+import segmentation
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SECONDS = int(os.getenv("JOB_CHUNK_SECONDS", "600"))
+# Lines per checkpointed batch; the translator packs them into requests and runs them concurrently
+TRANSLATION_BATCH_SIZE = int(os.getenv("JOB_TRANSLATION_BATCH_SIZE", "600"))
+# Also translate the text shown on screen (slides, titles) into a subtitle track of its own
+OCR_TEXT = os.getenv("JOB_OCR", "").lower() in ("1", "true", "yes")
+# Subtitle format -> key of its file in the job outputs
+SUBTITLE_OUTPUT_KEYS = {
+    "srt": "translated_subtitles",
+    "vtt": "vtt",
+    "ttml": "ttml",
+    "ass": "ass",
+    "json": "subtitles_json",
+}
+
+
+class JobManifest:
+    """
+    Progress of one job, persisted atomically to <job_dir>/manifest.json.
+    """
+
+    def __init__(self, job_dir):
+        self.path = os.path.join(job_dir, "manifest.json")
+        self.data = {"stages": {}, "chunks": {}, "batches": {}}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def stage(self, name):
+        """Data recorded when the stage completed, or None."""
+        return self.data["stages"].get(name)
+
+    def complete(self, name, **data):
+        self.data["stages"][name] = dict(data, completed=time.time())
+        self.save()
+
+    def chunk(self, index):
+        return self.data["chunks"].get(str(index))
+
+    def complete_chunk(self, index, record):
+        self.data["chunks"][str(index)] = record
+        self.save()
+
+    def batch(self, index):
+        return self.data["batches"].get(str(index))
+
+    def complete_batch(self, index, translations):
+        self.data["batches"][str(index)] = translations
+        self.save()
+
+
+def _transcribe_chunks(job_dir, manifest, audio_stage, transcribe_options):
+    """
+    Transcribe every audio chunk not yet in the manifest and return the
+    combined timed segments on the original timeline.
+    """
+    segments = []
+    for index, chunk in enumerate(audio_stage["chunks"]):
+        record = manifest.chunk(index)
+        metrics.CACHE_REQUESTS.inc(cache="transcript_chunks", result="miss" if record is None else "hit")
+        if record is None:
+            transcript = pipeline.transcribe_audio(os.path.join(job_dir, chunk["path"]), **transcribe_options)
+            record = {
+                "text": transcript.text,
+                "segments": transcript.timed_segments(chunk["duration"]),
+            }
+            manifest.complete_chunk(index, record)
+        segments.extend(
+            (start + chunk["offset"], end + chunk["offset"], text)
+            for start, end, text in record["segments"]
+        )
+    return segments
+
+
+def _translate_batches(manifest, translator, texts, target_language, translate_options, prefix=""):
+    """
+    Translate texts batch by batch, reusing batches already in the manifest
+    (recorded under `prefix` followed by the batch index).
+    """
+    translations = []
+    for index, start in enumerate(range(0, len(texts), TRANSLATION_BATCH_SIZE)):
+        batch = manifest.batch(f"{prefix}{index}")
+        metrics.CACHE_REQUESTS.inc(cache="translation_batches", result="miss" if batch is None else "hit")
+        if batch is None:
+            try:
+                with metrics.timed("translate_batch"):
+                    batch = translator.translate_batch(
+                        texts[start:start + TRANSLATION_BATCH_SIZE], target_language, **translate_options
+                    )
+            except Exception as e:
+                raise pipeline.PipelineError(f"Error during translation: {e}") from e
+            manifest.complete_batch(f"{prefix}{index}", batch)
+        translations.extend(batch)
+    return translations
+
+
+def run_job(job_dir, target_language, video_path=None, url=None, output_dir=None, name="video",
+            burn=True, transcribe_options=None, translator=None, translate_options=None,
+            keep_intermediate=False, profile=None, ocr_text=None):
+    """
+    Run (or resume) the pipeline for one video inside job_dir and return
+    the output paths. Outputs go to output_dir (default: job_dir).
+    `transcribe_options` go to pipeline.transcribe_audio; `translate_options`
+    to the translator's translate_batch (default: quality.translator(), the
+    QUALITY_TIER tier).
+    With `ocr_text` (default: JOB_OCR) the on-screen text is translated too.
+    With `profile` (default: PROFILE_JOBS) the job is profiled and the
+    profile files are added to the outputs (see profiling.py).
+    """
+    output_dir = output_dir or job_dir
+    os.makedirs(job_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+    args = (job_dir, target_language, video_path, url, output_dir, name, burn,
+            transcribe_options, translator, translate_options, keep_intermediate,
+            OCR_TEXT if ocr_text is None else ocr_text)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        if not (profiling.PROFILE_JOBS if profile is None else profile):
+            outputs = _run_job(*args)
+        else:
+            job_profile = profiling.JobProfile()
+            try:
+                with job_profile:
+                    outputs = _run_job(*args)
+            finally:
+                # Failed jobs keep their profile too
+                profile_paths = job_profile.save(output_dir, name)
+            outputs.update(profile_paths)
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.JOB_SECONDS.observe(elapsed, outcome=outcome)
+    outputs["seconds"] = round(elapsed, 3)
+    return outputs
+
+
+def _run_job(job_dir, target_language, video_path, url, output_dir, name, burn,
+             transcribe_options, translator, translate_options, keep_intermediate, ocr_text):
+    manifest = JobManifest(job_dir)
+    transcribe_options = dict(transcribe_options or {})
+    translate_options = dict(translate_options or {})
+
+    # Step 1: Get the source video
+    if url:
+        download = manifest.stage("download")
+        if download is None or not os.path.exists(download["video_path"]):
+            video_path, title = pipeline.download_video(url, job_dir)
+            manifest.complete("download", video_path=video_path, title=title)
+        else:
+            video_path = download["video_path"]
+
+    # Step 2: Extract audio, cut out silences and split it into chunks
+    audio_stage = manifest.stage("audio")
+    if audio_stage is None:
+        duration = pipeline.check_video_duration(video_path)
+        encoding = audio.encoding_for(transcribe_options.get("backend"))
+        audio_path = os.path.join(job_dir, f"audio{encoding.extension}")
+        pipeline.extract_audio_from_video(video_path, audio_path, encoding.ffmpeg_args())
+        if audio.TRIM_SILENCE:
+            speech_path = os.path.join(job_dir, f"speech{encoding.extension}")
+            time_map = audio.trim_silence(audio_path, speech_path, encoding=encoding)
+            os.replace(speech_path, audio_path)
+        else:
+            time_map = audio.TimeMap.identity(duration)
+        chunks_dir = os.path.join(job_dir, "chunks")
+        os.makedirs(chunks_dir, exist_ok=True)
+        chunks, offset = [], 0.0
+        for chunk_path in pipeline.split_audio(audio_path, chunks_dir, CHUNK_SECONDS):
+            chunk_duration = pipeline.check_video_duration(chunk_path)
+            chunks.append({"path": os.path.relpath(chunk_path, job_dir), "offset": offset, "duration": chunk_duration})
+            offset += chunk_duration
+        os.unlink(audio_path)
+        audio_bytes = sum(os.path.getsize(os.path.join(job_dir, chunk["path"])) for chunk in chunks)
+        metrics.AUDIO_PAYLOAD_BYTES.observe(audio_bytes, encoding=encoding.name)
+        manifest.complete("audio", duration=duration, chunks=chunks, time_map=time_map.to_dict(),
+                          encoding=encoding.name, audio_bytes=audio_bytes)
+        audio_stage = manifest.stage("audio")
+
+    # Step 3: Transcribe chunk by chunk, then map timings back to the video
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr") as ocr_pool:
+        ocr_future = None
+        ocr_stage = manifest.stage("ocr")
+        # A failed OCR stage is retried when the job runs again
+        if ocr_text and (ocr_stage is None or ocr_stage.get("error")):
+            # OCR keeps the CPU busy while transcription waits on the network
+            ocr_future = ocr_pool.submit(profiling.propagate(ocr.text_cues), video_path, audio_stage["duration"])
+        segments = _transcribe_chunks(job_dir, manifest, audio_stage, transcribe_options)
+        if ocr_future is not None:
+            try:
+                manifest.complete("ocr", cues=ocr_future.result())
+            except Exception as e:
+                # On-screen text is optional; the speech subtitles are still delivered
+                logger.warning("On-screen text extraction failed for %s: %s", video_path, e)
+                manifest.complete("ocr", cues=[], error=str(e))
+    if audio_stage.get("time_map"):
+        segments = audio.TimeMap.from_dict(audio_stage["time_map"]).remap_segments(segments)
+    original_subtitle_file = exporters.export(
+        segmentation.reflow(segments, duration=audio_stage["duration"]),
+        os.path.join(output_dir, f"{name}_original"), ["srt"]
+    )["srt"]
+
+    # Step 4: Translate batch by batch
+    translator = translator or quality.translator()
+    texts = [text for _, _, text in segments]
+    translations = _translate_batches(manifest, translator, texts, target_language, translate_options)
+    translated_segments = segmentation.reflow(
+        [(start, end, text) for (start, end, _), text in zip(segments, translations)], target_language,
+        duration=audio_stage["duration"],
+    )
+    slug = pipeline.language_slug(target_language)
+    # SRT is needed for the burn-in and VTT for players, whatever else is asked for
+    subtitle_files = exporters.export(
+        translated_segments, os.path.join(output_dir, f"{name}_{slug}"), ["srt", "vtt", *exporters.EXPORT_FORMATS]
+    )
+    translated_subtitle_file = subtitle_files["srt"]
+
+    outputs = {
+        "duration": audio_stage["duration"],
+        "audio_encoding": audio_stage.get("encoding"),
+        "audio_bytes": audio_stage.get("audio_bytes"),
+        "original_subtitles": original_subtitle_file,
+    }
+    outputs.update((SUBTITLE_OUTPUT_KEYS[fmt], path) for fmt, path in subtitle_files.items())
+
+    # On-screen text: translated like the speech, in a track of its own since it overlaps the speech
+    ocr_stage = manifest.stage("ocr") if ocr_text else None
+    if ocr_stage and ocr_stage.get("error"):
+        outputs["ocr_error"] = ocr_stage["error"]
+    elif ocr_stage:
+        onscreen = ocr_stage["cues"]
+        onscreen_translations = _translate_batches(
+            manifest, translator, [text for _, _, text in onscreen], target_language, translate_options, prefix="ocr_"
+        )
+        onscreen_files = exporters.export(
+            [(start, end, text) for (start, end, _), text in zip(onscreen, onscreen_translations)],
+            os.path.join(output_dir, f"{name}_{slug}_onscreen"), ["srt", "vtt"],
+        )
+        outputs["onscreen_subtitles"] = onscreen_files["srt"]
+        outputs["onscreen_vtt"] = onscreen_files["vtt"]
+
+    # Step 5: Burn subtitles into the video
+    if burn:
+        output_video_file = os.path.join(output_dir, f"{name}_translated.mp4")
+        if manifest.stage("render") is None or not os.path.exists(output_video_file):
+            render.burn_subtitles(video_path, translated_subtitle_file, output_video_file)
+            manifest.complete("render", path=output_video_file)
+        outputs["video"] = output_video_file
+
+    if not keep_intermediate:
+        for chunk in audio_stage["chunks"]:
+            chunk_path = os.path.join(job_dir, chunk["path"])
+            if os.path.exists(chunk_path):
+                os.unlink(chunk_path)
+    return outputs
+
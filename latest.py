@@ -1,19 +1,25 @@
 import streamlit as st
 import os
-import google.generativeai as genai
-from tempfile import NamedTemporaryFile
 import base64
+import contextlib
 import random
-import langdetect
-import subprocess
-import re
-
-# Set up API keys (consider using environment variables for security)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# Initialize Google Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-2.0-flash')
+import streamlit.components.v1 as components
+import artifacts
+import audio
+import exporters
+import pipeline
+import player
+import profiling
+import render
+import segmentation
+import workspace
+from subtitles import parse_srt, segments_to_srt, segments_to_vtt
+
+# Backends are chosen with environment variables and built lazily on first
+# use (see resources.py), so reruns don't pay for imports or client setup:
+# TRANSCRIBER_BACKEND: "gemini" (default), "assemblyai" or "local"
+# TRANSLATOR_BACKEND: "gemini" (default) or "local"
+GEMINI_MODEL = 'gemini-2.0-flash'
 
 # Define supported languages
 LANGUAGES = {
@@ -33,178 +39,108 @@ LANGUAGES = {
     "Vietnamese": "Vietnamese"
 }
 
-def format_time(seconds):
-    """Formats seconds into SRT time format (HH:MM:SS,ms)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    return f"{hours:02}:{minutes:02}:{secs:02},{milliseconds:03}"
-
-def create_srt_from_text(text, duration_seconds):
-    """
-    Creates a basic SRT string from plain text and total duration.
-    Splits text into sentences and assigns approximate timings.
-    """
-    if not text:
-        return ""
-
-    # Split text into sentences or manageable chunks
-    # This regex tries to split by common sentence endings, but keeps the delimiter.
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-
-    if not sentences:
-        return ""
-
-    srt_content = []
-    num_sentences = len(sentences)
-    time_per_sentence = duration_seconds / num_sentences if num_sentences > 0 else 0
-
-    for i, sentence in enumerate(sentences):
-        start_time_seconds = i * time_per_sentence
-        end_time_seconds = (i + 1) * time_per_sentence
-
-        # Ensure end time doesn't exceed total duration
-        if end_time_seconds > duration_seconds:
-            end_time_seconds = duration_seconds
-
-        start_time_str = format_time(start_time_seconds)
-        end_time_str = format_time(end_time_seconds)
-
-        srt_content.append(f"{i + 1}")
-        srt_content.append(f"{start_time_str} --> {end_time_str}")
-        srt_content.append(sentence)
-        srt_content.append("") # Empty line for next entry
-
-    return "\n".join(srt_content)
-
-
 def check_video_duration(video_file_path):
     """
     Check if the video duration is 10 minutes or less using ffprobe
     Returns duration in seconds.
     """
     try:
-        command = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of",
-                   "default=noprint_wrappers=1:nokey=1", video_file_path]
-        duration_str = subprocess.check_output(command).decode().strip()
-        duration = float(duration_str)
-    except Exception as e:
-        st.error(f"Error getting video duration: {e}")
-        duration = 0
-    return duration
-
-def extract_audio_from_video(video_file_path, audio_output_path):
+        return pipeline.check_video_duration(video_file_path)
+    except pipeline.PipelineError as e:
+        st.error(str(e))
+        return 0
+
+def extract_audio_from_video(video_file_path, audio_output_path, encoding):
     """
     Extracts audio from a video file using ffmpeg.
     """
-    command = [
-        "ffmpeg",
-        "-i", video_file_path,
-        "-vn", # No video
-        "-acodec", "libmp3lame", # Use MP3 codec
-        "-q:a", "2", # VBR quality 2 (good quality)
-        "-ar", "44100", # Audio sample rate
-        "-ac", "1", # Mono audio
-        audio_output_path
-    ]
     try:
-        subprocess.run(command, check=True, capture_output=True)
+        pipeline.extract_audio_from_video(video_file_path, audio_output_path, encoding.ffmpeg_args())
         return True
-    except subprocess.CalledProcessError as e:
-        st.error(f"Error extracting audio: {e.stderr.decode()}")
+    except pipeline.PipelineError as e:
+        st.error(str(e))
         return False
 
-def transcribe_audio_with_gemini(audio_file_path):
+def trim_silence(audio_file_path, output_path, duration, encoding):
     """
-    Transcribe audio using Google Gemini API.
+    Cuts silences out of the audio before transcription. Returns the path to
+    transcribe and the TimeMap back to the video timeline.
     """
+    if not audio.TRIM_SILENCE:
+        return audio_file_path, audio.TimeMap.identity(duration)
     try:
-        with open(audio_file_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-        
-        base64_audio_data = base64.b64encode(audio_bytes).decode('utf-8')
+        return output_path, audio.trim_silence(audio_file_path, output_path, encoding=encoding)
+    except (ImportError, pipeline.PipelineError) as e:
+        st.warning(f"Transcribing the full audio; silence trimming failed: {e}")
+        return audio_file_path, audio.TimeMap.identity(duration)
 
-        # Construct the parts for the generateContent call
-        parts = [
-            {"text": "Transcribe the audio content of this file."},
-            {"inlineData": {"mimeType": "audio/mpeg", "data": base64_audio_data}} # Use audio/mpeg for MP3
-        ]
-
-        # Call Gemini API
-        response = model.generate_content(parts)
-        
-        return response.text
-    except Exception as e:
-        st.error(f"Error during Gemini transcription: {e}")
+def transcribe_audio(audio_file_path):
+    """
+    Transcribe audio using the configured speech-to-text backend.
+    """
+    try:
+        return pipeline.transcribe_audio(audio_file_path, model_name=GEMINI_MODEL)
+    except pipeline.PipelineError as e:
+        st.error(str(e))
         return None
 
 def is_english(text):
     """
     Check if the given text is in English
     """
-    try:
-        return langdetect.detect(text) == 'en'
-    except:
-        return False
+    return pipeline.is_english(text)
 
 def translate_content(content, target_language):
     """
-    Translate the content to the target language using Google Gemini
+    Translate the content to the target language using the configured translation backend
     """
-    prompt = f"""translate the full text to {target_language} with professional, high-quality translation. Keep all numbers, punctuation, and special characters unchanged. Only translate the words. Ensure the output format matches the input structure as much as possible (e.g., if it's an SRT, maintain the SRT format, otherwise just the text):
-
-{content}
-
-Translated text:"""
-
-    generation_config = genai.GenerationConfig(
-        temperature=0.4,
-        top_p=1,
-        top_k=1,)
-
-    safety_settings = [
-        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-    ]
-
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config=generation_config,
-            safety_settings=safety_settings
-        )
-        return response.text
-    except Exception as e:
-        st.error(f"Error during Gemini translation: {e}")
+        return pipeline.translate_content(content, target_language, model_name=GEMINI_MODEL)
+    except pipeline.PipelineError as e:
+        st.error(str(e))
         return None
 
-def burn_subtitles_into_video(video_path, subtitle_path, output_path):
+def render_preview(video_path, subtitle_path, output_path):
     """
-    Burns subtitles into a video using ffmpeg.
+    Renders a low-resolution preview with burned subtitles; the full-quality
+    video is rendered in the background (see show_background_renders).
     """
-    command = [
-        "ffmpeg",
-        "-i", video_path,
-        "-vf", f'subtitles="{subtitle_path.replace("\\\\", "/")}"'
-        "-c:a", "copy",
-        output_path
-    ]
     try:
-        subprocess.run(command, check=True, capture_output=True)
+        render.render_preview(video_path, subtitle_path, output_path)
         return True
-    except subprocess.CalledProcessError as e:
-        st.error(f"Error burning subtitles: {e.stderr.decode()}")
+    except pipeline.PipelineError as e:
+        st.error(str(e))
         return False
 
-def get_binary_file_downloader_html(bin_file, file_label='File'):
+def show_background_renders():
+    """
+    Shows the full-quality videos started in this session: a download link
+    once rendered, otherwise a button to check again.
+    """
+    for job_id, (future, file_name) in list(st.session_state.get("full_renders", {}).items()):
+        if not future.done():
+            st.info(f"Rendering the full-quality {file_name}...")
+            st.button("Check again", key=f"check_{job_id}")
+            continue
+        try:
+            path = future.result()
+        except Exception as e:
+            st.error(f"Full-quality render of {file_name} failed: {e}")
+            del st.session_state.full_renders[job_id]
+            continue
+        if not os.path.exists(path):
+            # Expired from the artifact store
+            del st.session_state.full_renders[job_id]
+            continue
+        st.subheader("Full-Quality Video with Subtitles")
+        st.markdown(get_binary_file_downloader_html(path, "Video with Translated Subtitles", file_name=file_name), unsafe_allow_html=True)
+        st.video(path)
+
+def get_binary_file_downloader_html(bin_file, file_label='File', file_name=None):
     with open(bin_file, 'rb') as f:
         data = f.read()
     bin_str = base64.b64encode(data).decode()
-    href = f'<a href="data:application/octet-stream;base64,{bin_str}" download="{os.path.basename(bin_file)}">Download {file_label}</a>'
+    href = f'<a href="data:application/octet-stream;base64,{bin_str}" download="{file_name or os.path.basename(bin_file)}">Download {file_label}</a>'
     return href
 
 def get_random_wisdom():
@@ -295,114 +231,159 @@ def main():
     # Language selection
     target_language = st.selectbox("Select target language for translation:", list(LANGUAGES.keys()))
 
+    # The player shows the subtitles over the video; burning them in is only needed for a standalone file
+    burn_video = st.checkbox("Also burn the subtitles into a downloadable video (slower)", value=False)
+
+    show_background_renders()
+
     if uploaded_file is not None:
         file_name_base = os.path.splitext(uploaded_file.name)[0]
 
-        # Save uploaded file to a temporary path for ffmpeg
-        with NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_video_file:
-            tmp_video_file.write(uploaded_file.getvalue())
-            tmp_video_path = tmp_video_file.name
-
-        # Check video duration
-        video_duration = check_video_duration(tmp_video_path)
-        if video_duration == 0 or video_duration > 600: # 600 seconds = 10 minutes
-            st.error("The uploaded video exceeds the 10-minute limit or duration could not be determined. Please upload a shorter video.")
-            os.unlink(tmp_video_path)
-            return
-
-        if st.button("Process Video"):
-            with st.spinner(f"Processing video and translating to {target_language}... This may take a while."):
-                # Display random wisdoms during processing
-                wisdom_placeholder = st.empty()
-                # Display 3 wisdoms during the entire process
-                for _ in range(3):
-                    wisdom_placeholder.info(f"While you wait... {get_random_wisdom()}")
-
-                # Step 1: Extract audio
-                audio_temp_file = NamedTemporaryFile(delete=False, suffix=".mp3")
-                audio_temp_path = audio_temp_file.name
-                audio_temp_file.close() # Close the file immediately so ffmpeg can write to it
-
-                if not extract_audio_from_video(tmp_video_path, audio_temp_path):
-                    wisdom_placeholder.empty()
-                    st.error("Failed to extract audio from video.")
-                    os.unlink(tmp_video_path)
-                    os.unlink(audio_temp_path)
-                    return
-
-                # Step 2: Transcribe audio using Gemini
-                transcribed_text = transcribe_audio_with_gemini(audio_temp_path)
-                if transcribed_text is None:
-                    wisdom_placeholder.empty()
-                    st.error("Failed to transcribe audio using Gemini.")
-                    os.unlink(tmp_video_path)
-                    os.unlink(audio_temp_path)
-                    return
-
-                # Step 3: Create SRT from transcribed text
-                original_subtitles = create_srt_from_text(transcribed_text, video_duration)
-
-                # Check if the subtitles are in English
-                if not is_english(transcribed_text): # Use transcribed_text for language detection
-                    wisdom_placeholder.empty()
-                    st.error("The video appears to be in a language other than English. Please upload an English video.")
-                    os.unlink(tmp_video_path)
-                    os.unlink(audio_temp_path)
-                    return
-
-                # Save original subtitles
-                original_subtitle_file = f"{file_name_base}_original.srt"
-                with open(original_subtitle_file, "w", encoding="utf-8") as f:
-                    f.write(original_subtitles)
-
-                # Step 4: Translate subtitles
-                translated_subtitles = translate_content(original_subtitles, LANGUAGES[target_language])
-                if translated_subtitles is None:
-                    wisdom_placeholder.empty()
-                    st.error("Failed to translate subtitles using Gemini.")
-                    os.unlink(tmp_video_path)
-                    os.unlink(audio_temp_path)
-                    os.unlink(original_subtitle_file)
-                    return
-
-                # Save translated subtitles
-                translated_subtitle_file = f"{file_name_base}_{target_language.lower().replace(' ', '_')}.srt"
-                with open(translated_subtitle_file, "w", encoding="utf-8") as f:
-                    f.write(translated_subtitles)
-
-                # Step 5: Burn subtitles into video
-                output_video_file = f"{file_name_base}_translated.mp4"
-                if burn_subtitles_into_video(tmp_video_path, translated_subtitle_file, output_video_file):
-                    st.success("Subtitles successfully burned into the video!")
-                else:
-                    st.error("Failed to burn subtitles into the video.")
-                
-                # Clean up temporary files
-                os.unlink(tmp_video_path)
-                os.unlink(audio_temp_path)
-
-                wisdom_placeholder.empty()  # Remove the wisdom messages
-                st.success("Processing complete!")
-
-                # Download buttons
-                st.markdown(get_binary_file_downloader_html(original_subtitle_file, "Original Subtitles"), unsafe_allow_html=True)
-                st.markdown(get_binary_file_downloader_html(translated_subtitle_file, f"{target_language} Subtitles"), unsafe_allow_html=True)
-                st.markdown(get_binary_file_downloader_html(output_video_file, "Video with Translated Subtitles"), unsafe_allow_html=True)
-
-                # Display video with subtitles
-                st.subheader("Video Preview with Subtitles")
-                st.video(output_video_file)
-
-                # Instructions for offline viewing
-                st.markdown("""
-                ### Instructions for Offline Viewing:
-                1. Create a new folder on your computer (e.g., "Subtitled_Videos").
-                2. Download both the original video and the subtitle file you want to use.
-                3. Place both files in the folder you created. Make sure they have the same name (except for the file extension).
-                4. To watch with subtitles:
-                   - Use VLC Media Player: It should automatically detect the subtitle file if it's in the same folder and has the same name as the video.
-                5. Enjoy your video with translated subtitles!
-                """)
+        # Everything for this run lives in a private workspace that is removed on exit
+        with workspace.Workspace() as ws:
+            try:
+                tmp_video_path = ws.write_upload(uploaded_file, f"input{os.path.splitext(uploaded_file.name)[1]}")
+            except workspace.QuotaExceeded as e:
+                st.error(str(e))
+                return
+
+            # Check video duration
+            video_duration = check_video_duration(tmp_video_path)
+            if video_duration == 0 or video_duration > 600: # 600 seconds = 10 minutes
+                st.error("The uploaded video exceeds the 10-minute limit or duration could not be determined. Please upload a shorter video.")
+                return
+
+            if st.button("Process Video"):
+                # PROFILE_JOBS=1 profiles the whole run, Streamlit rendering included
+                job_profile = profiling.JobProfile() if profiling.PROFILE_JOBS else contextlib.nullcontext()
+                with job_profile, st.spinner(f"Processing video and translating to {target_language}... This may take a while."):
+                    # Display random wisdoms during processing
+                    wisdom_placeholder = st.empty()
+                    # Display 3 wisdoms during the entire process
+                    for _ in range(3):
+                        wisdom_placeholder.info(f"While you wait... {get_random_wisdom()}")
+
+                    # Step 1: Extract audio
+                    encoding = audio.encoding_for()
+                    audio_temp_path = ws.file(f"audio{encoding.extension}")
+                    if not extract_audio_from_video(tmp_video_path, audio_temp_path, encoding):
+                        wisdom_placeholder.empty()
+                        st.error("Failed to extract audio from video.")
+                        return
+
+                    # Step 2: Cut out silences and transcribe audio
+                    speech_path, time_map = trim_silence(audio_temp_path, ws.file(f"speech{encoding.extension}"), video_duration, encoding)
+                    transcript = transcribe_audio(speech_path)
+                    if transcript is None:
+                        wisdom_placeholder.empty()
+                        st.error("Failed to transcribe audio.")
+                        return
+
+                    # Step 3: Create SRT from the transcript, on the video timeline
+                    transcribed_text = transcript.text
+                    original_segments = time_map.remap_segments(transcript.timed_segments(time_map.trimmed_duration))
+                    # Whole sentences translate best; only the saved file gets the readable layout
+                    original_subtitles = segments_to_srt(original_segments)
+
+                    # Check if the subtitles are in English
+                    if not is_english(transcribed_text): # Use transcribed_text for language detection
+                        wisdom_placeholder.empty()
+                        st.error("The video appears to be in a language other than English. Please upload an English video.")
+                        return
+
+                    # Save original subtitles
+                    original_subtitle_file = ws.file(f"{file_name_base}_original.srt")
+                    with open(original_subtitle_file, "w", encoding="utf-8") as f:
+                        original_cues = segmentation.reflow(original_segments, duration=video_duration)
+                        f.write(segments_to_srt(original_cues))
+
+                    # Step 4: Translate subtitles
+                    translated_subtitles = translate_content(original_subtitles, LANGUAGES[target_language])
+                    if translated_subtitles is None:
+                        wisdom_placeholder.empty()
+                        st.error("Failed to translate subtitles.")
+                        return
+
+                    # Save translated subtitles in every export format
+                    subtitle_files = exporters.export(
+                        parse_srt(translated_subtitles),
+                        ws.file(f"{file_name_base}_{target_language.lower().replace(' ', '_')}"),
+                        ["srt", "vtt", *exporters.EXPORT_FORMATS],
+                    )
+                    translated_subtitle_file = subtitle_files["srt"]
+
+                    # Step 5 (optional): Burn subtitles: a quick low-resolution preview now, full quality in the background
+                    store = artifacts.store()
+                    job_id = artifacts.new_job_id()
+                    preview_video_file = ws.file(f"{file_name_base}_preview.mp4")
+                    if burn_video:
+                        if render_preview(tmp_video_path, translated_subtitle_file, preview_video_file):
+                            st.success("Subtitles burned into a preview; the full-quality video is rendering in the background.")
+                        else:
+                            st.error("Failed to burn subtitles into the video.")
+                        output_name = f"{file_name_base}_translated.mp4"
+                        st.session_state.setdefault("full_renders", {})[job_id] = (
+                            render.render_in_background(tmp_video_path, translated_subtitle_file, output_name, job_id),
+                            output_name,
+                        )
+
+                    try:
+                        ws.check_quota()
+                    except workspace.QuotaExceeded as e:
+                        wisdom_placeholder.empty()
+                        st.error(str(e))
+                        return
+
+                    # Publish the outputs under a job of their own before the workspace goes away
+                    outputs = [
+                        (original_subtitle_file, "Original Subtitles"),
+                        *((path, f"{target_language} Subtitles ({fmt.upper()})") for fmt, path in subtitle_files.items()),
+                        (preview_video_file, "Preview Video (low resolution)"),
+                    ]
+                    published = {
+                        path: store.publish(job_id, path)
+                        for path, _ in outputs
+                        if os.path.exists(path)
+                    }
+
+                    wisdom_placeholder.empty()  # Remove the wisdom messages
+                    st.success("Processing complete!")
+
+                    # Download buttons
+                    for path, label in outputs:
+                        if path in published:
+                            st.markdown(get_binary_file_downloader_html(published[path], label, file_name=os.path.basename(path)), unsafe_allow_html=True)
+
+                    # Display video with subtitles, shown by the browser rather than burned in
+                    st.subheader("Video with Subtitles")
+                    with open(subtitle_files["vtt"], encoding="utf-8") as f:
+                        subtitle_tracks = {
+                            "English (original)": segments_to_vtt(original_cues),
+                            target_language: f.read(),
+                        }
+                    st.video(tmp_video_path)
+                    components.html(player.attach_tracks(subtitle_tracks, selected=target_language), height=player.TRACK_BAR_HEIGHT)
+
+                    if preview_video_file in published:
+                        st.subheader("Preview with Burned Subtitles")
+                        st.video(published[preview_video_file])
+                        st.info("The full-quality video will appear near the top of the page when it is ready.")
+
+                    # Instructions for offline viewing
+                    st.markdown("""
+                    ### Instructions for Offline Viewing:
+                    1. Create a new folder on your computer (e.g., "Subtitled_Videos").
+                    2. Download both the original video and the subtitle file you want to use.
+                    3. Place both files in the folder you created. Make sure they have the same name (except for the file extension).
+                    4. To watch with subtitles:
+                       - Use VLC Media Player: It should automatically detect the subtitle file if it's in the same folder and has the same name as the video.
+                    5. Enjoy your video with translated subtitles!
+                    """)
+
+                if profiling.PROFILE_JOBS:
+                    st.subheader("Profile")
+                    for path in job_profile.save(ws.path, file_name_base).values():
+                        st.markdown(get_binary_file_downloader_html(store.publish(job_id, path), os.path.basename(path), file_name=os.path.basename(path)), unsafe_allow_html=True)
 
     else:
         st.markdown("""
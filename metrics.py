@@ -0,0 +1,267 @@
+"""
+In-process metrics with Prometheus text and JSON exposition.
+
+    @metrics.timed("extract_audio")
+    def extract_audio_from_video(...): ...
+
+    with metrics.timed("translate_batch"):
+        ...
+
+    metrics.CACHE_REQUESTS.inc(cache="resources", result="hit")
+
+The API serves REGISTRY at /metrics (Prometheus text format) and
+/metrics.json. Only the standard library is used, so any module can record
+metrics without pulling in extra dependencies.
+"""
+import contextlib
+import math
+import os
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base class: a named family of samples keyed by label values.
+    """
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, label_values, extra_labels, value) tuples for exposition."""
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {"labels": dict(zip(self.labelnames, key)), "value": value}
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state["counts"]):
+                    cumulative += count
+                    samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+                samples.append(("_sum", key, (), state["sum"]))
+                samples.append(("_count", key, (), state["count"]))
+        return samples
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "count": state["count"],
+                    "sum": state["sum"],
+                    "mean": state["sum"] / state["count"] if state["count"] else None,
+                    "buckets": {
+                        _format_value(bound): count
+                        for bound, count in zip(self.buckets, state["counts"])
+                    },
+                }
+                for key, state in sorted(self._values.items())
+            ]
+
+
+class Registry:
+    """
+    Named metrics of this process.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render_prometheus(self):
+        """Text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, key, extra, value in metric.samples():
+                labels = _format_labels(metric.labelnames, key, extra)
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """JSON-serializable view of every metric."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return {
+            "timestamp": time.time(),
+            "metrics": {
+                metric.name: {"type": metric.kind, "help": metric.documentation, "samples": metric.snapshot()}
+                for metric in metrics
+            },
+        }
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "pipeline_stage_seconds", "Duration of pipeline steps.", ["stage", "outcome"])
+STAGE_CPU_SECONDS = REGISTRY.histogram(
+    "pipeline_stage_cpu_seconds", "CPU time of pipeline steps (calling thread plus subprocesses).", ["stage", "outcome"])
+API_TOKENS = REGISTRY.counter(
+    "model_tokens_total", "Tokens reported by model APIs.", ["backend", "kind"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Lookups in process caches and job checkpoints.", ["cache", "result"])
+JOBS = REGISTRY.gauge(
+    "jobs", "API jobs by status (queued jobs are the queue depth).", ["status"])
+AUDIO_SECONDS = REGISTRY.counter(
+    "audio_seconds_total", "Audio seconds removed before transcription.", ["kind"])
+AUDIO_PAYLOAD_BYTES = REGISTRY.histogram(
+    "audio_payload_bytes", "Size of the audio sent for transcription per job.", ["encoding"],
+    buckets=(1e5, 5e5, 1e6, 5e6, 1e7, 2e7, 5e7, 1e8, 5e8))
+JOB_SECONDS = REGISTRY.histogram(
+    "job_seconds", "End-to-end duration of run_job calls.", ["outcome"])
+TRANSFER_BYTES = REGISTRY.counter(
+    "transfer_bytes_total", "Bytes received from and sent to clients.", ["direction", "channel"])
+GLOSSARY_CHECKS = REGISTRY.counter(
+    "glossary_checks_total", "Translated lines checked against the glossary.", ["result"])
+CUE_CHECKS = REGISTRY.counter(
+    "cue_checks_total", "Translated lines by verification result (ok, fixed by review, still flagged).", ["result"])
+OCR_FRAMES = REGISTRY.counter(
+    "ocr_frames_total", "Sampled video frames by OCR outcome (read, or duplicate of a slide already read).", ["result"])
+
+
+def _cpu_seconds():
+    """CPU time of the calling thread plus finished child processes (ffmpeg)."""
+    times = os.times()
+    return time.thread_time() + times.children_user + times.children_system
+
+
+class timed(contextlib.ContextDecorator):
+    """
+    Record the wall and CPU time of a block or function in
+    pipeline_stage_seconds / pipeline_stage_cpu_seconds, labelled with the
+    outcome ("ok" or "error").
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._starts = threading.local()
+
+    def __enter__(self):
+        self._starts.__dict__.setdefault("stack", []).append((time.perf_counter(), _cpu_seconds()))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_start, cpu_start = self._starts.stack.pop()
+        outcome = "error" if exc_type else "ok"
+        STAGE_SECONDS.observe(time.perf_counter() - wall_start, stage=self.stage, outcome=outcome)
+        STAGE_CPU_SECONDS.observe(_cpu_seconds() - cpu_start, stage=self.stage, outcome=outcome)
+        return False
+
+
+def record_usage(backend, response):
+    """Count the prompt and output tokens of a model response, if reported."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, attribute in (("prompt", "prompt_token_count"), ("output", "candidates_token_count")):
+        count = getattr(usage, attribute, None)
+        if count:
+            API_TOKENS.inc(count, backend=backend, kind=kind)
@@ -0,0 +1,168 @@
+"""
+On-screen text: slides, titles and captions read from the video with Tesseract.
+
+Reading every frame would cost many times the video's duration, so only a
+few frames are read:
+
+1. ffmpeg samples OCR_SAMPLE_FPS frames per second and keeps those where
+   the picture changes (scene score above OCR_SCENE_THRESHOLD), plus the
+   first one. Slides and talking heads yield a few frames per minute.
+2. Each kept frame gets a difference hash (dHash). A frame within
+   OCR_HASH_DISTANCE bits of one already seen is the same slide (shown
+   again, or re-detected after a camera cut) and reuses its text.
+3. The remaining frames are read in a process pool, one single-threaded
+   Tesseract per core.
+
+Each paragraph of a slide becomes a cue lasting until the next scene
+change, ready to be translated with the speech:
+
+    cues = ocr.text_cues(video_path)   # [(12.0, 47.5, "Quarterly results"), ...]
+
+The Docker image ships the Tesseract packs of every language in
+TESSERACT_LANGUAGES; the default reads English text (OCR_LANGUAGES).
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+import pipeline
+
+OCR_SAMPLE_FPS = float(os.getenv("OCR_SAMPLE_FPS", "1"))
+OCR_SCENE_THRESHOLD = float(os.getenv("OCR_SCENE_THRESHOLD", "0.3"))
+# Of 64 bits; screen recordings of the same slide differ by a few bits
+OCR_HASH_DISTANCE = int(os.getenv("OCR_HASH_DISTANCE", "6"))
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "60"))
+# Paragraphs with fewer letters and digits are usually noise (logos, icons, edges)
+OCR_MIN_CHARS = int(os.getenv("OCR_MIN_CHARS", "4"))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "eng")
+
+# Tesseract language packs installed in the Docker image
+TESSERACT_LANGUAGES = {
+    "Arabic": "ara",
+    "Chinese (Simplified)": "chi_sim",
+    "English": "eng",
+    "French": "fra",
+    "German": "deu",
+    "Hindi": "hin",
+    "Italian": "ita",
+    "Japanese": "jpn",
+    "Korean": "kor",
+    "Portuguese": "por",
+    "Russian": "rus",
+    "Spanish": "spa",
+    "Swedish": "swe",
+    "Turkish": "tur",
+    "Vietnamese": "vie",
+}
+
+
+def scene_frames(video_path, output_dir, fps=OCR_SAMPLE_FPS, threshold=OCR_SCENE_THRESHOLD):
+    """(time, image path) of the sampled frames that start a new scene."""
+    select = f"fps={fps},select='eq(n\\,0)+gt(scene\\,{threshold})',showinfo"
+    command = ["ffmpeg", "-hide_banner", "-i", video_path, "-an", "-vf", select, "-vsync", "vfr",
+               os.path.join(output_dir, "frame_%05d.png")]
+    try:
+        result = pipeline.run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise pipeline.PipelineError(f"Error sampling frames: {e.stderr.decode(errors='replace')}") from e
+    # showinfo logs one line per frame written, in order
+    times = [
+        float(line.split("pts_time:", 1)[1].split()[0])
+        for line in result.stderr.decode(errors="replace").splitlines()
+        if "Parsed_showinfo" in line and "pts_time:" in line
+    ]
+    return [(time, os.path.join(output_dir, f"frame_{i:05d}.png")) for i, time in enumerate(times, 1)]
+
+
+def dhash(image_path, size=8):
+    """64-bit difference hash: which of each pair of neighbouring pixels is brighter."""
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        pixels = list(image.convert("L").resize((size + 1, size), Image.BILINEAR).getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            bits = bits << 1 | (left > pixels[row * (size + 1) + col + 1])
+    return bits
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _init_worker():
+    # One Tesseract thread per process; the pool already uses every core
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def read_text(image_path, languages=OCR_LANGUAGES, min_confidence=OCR_MIN_CONFIDENCE):
+    """Paragraphs of text in an image, from the words Tesseract is confident about."""
+    import pytesseract
+
+    data = pytesseract.image_to_data(image_path, lang=languages, output_type=pytesseract.Output.DICT)
+    paragraphs = {}
+    for i, word in enumerate(data["text"]):
+        if word.strip() and float(data["conf"][i]) >= min_confidence:
+            paragraphs.setdefault((data["block_num"][i], data["par_num"][i]), []).append(word.strip())
+    texts = (" ".join(words) for words in paragraphs.values())
+    return [text for text in texts if sum(c.isalnum() for c in text) >= OCR_MIN_CHARS]
+
+
+def _tesseract_errors():
+    """Exceptions raised when Tesseract is missing or fails on an image."""
+    try:
+        import pytesseract
+    except ImportError:
+        return (ImportError,)
+    return (pytesseract.TesseractError, pytesseract.TesseractNotFoundError)
+
+
+@metrics.timed("ocr")
+def text_cues(video_path, duration=None, language="English", workers=None):
+    """
+    (start, end, text) cues of the text shown on screen, one per paragraph
+    of each slide, lasting until the next scene change.
+    """
+    languages = TESSERACT_LANGUAGES.get(language, OCR_LANGUAGES)
+    duration = duration or pipeline.check_video_duration(video_path)
+    frames_dir = tempfile.mkdtemp(prefix="ocr-")
+    try:
+        frames = scene_frames(video_path, frames_dir)
+        if not frames:
+            return []
+        with ProcessPoolExecutor(max_workers=workers or OCR_WORKERS, initializer=_init_worker) as pool:
+            hashes = list(pool.map(dhash, [path for _, path in frames]))
+
+            # Index of the first frame showing the same slide, for every frame
+            slides, unique = [], []
+            for i, frame_hash in enumerate(hashes):
+                same = next((j for j in unique if hamming(hashes[j], frame_hash) <= OCR_HASH_DISTANCE), None)
+                if same is None:
+                    unique.append(i)
+                    same = i
+                slides.append(same)
+            metrics.OCR_FRAMES.inc(len(unique), result="read")
+            metrics.OCR_FRAMES.inc(len(frames) - len(unique), result="duplicate")
+
+            try:
+                texts = dict(zip(unique, pool.map(read_text, [frames[i][1] for i in unique],
+                                                  [languages] * len(unique))))
+            except _tesseract_errors() as e:
+                raise pipeline.PipelineError(f"Error reading on-screen text: {e}") from e
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+
+    cues = []
+    for i, ((start, _), slide) in enumerate(zip(frames, slides)):
+        if i and slides[i - 1] == slide:
+            # Still the same slide (e.g. the presenter moved); its cues are extended below
+            continue
+        end = next((time for (time, _), other in zip(frames[i + 1:], slides[i + 1:]) if other != slide), duration)
+        cues.extend((start, end, text) for text in texts[slide])
+    return cues
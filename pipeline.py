@@ -0,0 +1,204 @@
+"""
+UI-independent video translation pipeline.
+
+These functions raise PipelineError instead of reporting through Streamlit,
+so the same steps drive the Streamlit apps, the batch CLI and the API.
+"""
+import os
+import subprocess
+import time
+
+import metrics
+import profiling
+import resources
+
+
+class PipelineError(Exception):
+    """A pipeline step failed; the message is suitable for end users."""
+
+
+def run_command(command):
+    """
+    Run an ffmpeg/ffprobe command, capturing its output, and report its
+    wall time to the active job profile. Raises CalledProcessError.
+    """
+    start = time.perf_counter()
+    returncode = None
+    try:
+        result = subprocess.run(command, check=True, capture_output=True)
+        returncode = result.returncode
+        return result
+    except subprocess.CalledProcessError as e:
+        returncode = e.returncode
+        raise
+    finally:
+        profiling.record_command(command, time.perf_counter() - start, returncode)
+
+
+@metrics.timed("check_video_duration")
+def check_video_duration(video_file_path):
+    """
+    Get the video duration in seconds using ffprobe.
+    """
+    command = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of",
+               "default=noprint_wrappers=1:nokey=1", video_file_path]
+    try:
+        duration_str = run_command(command).stdout.decode().strip()
+        return float(duration_str)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        raise PipelineError(f"Error getting video duration: {e}") from e
+
+
+MP3_AUDIO_ARGS = [
+    "-acodec", "libmp3lame", # Use MP3 codec
+    "-q:a", "2", # VBR quality 2 (good quality)
+    "-ar", "44100", # Audio sample rate
+    "-ac", "1", # Mono audio
+]
+
+
+@metrics.timed("extract_audio")
+def extract_audio_from_video(video_file_path, audio_output_path, audio_args=None):
+    """
+    Extracts audio from a video file using ffmpeg. `audio_args` are the
+    encoder options (default: MP3; see audio.encoding_for).
+    """
+    command = [
+        "ffmpeg", "-y",
+        "-i", video_file_path,
+        "-vn", # No video
+        *(audio_args or MP3_AUDIO_ARGS),
+        audio_output_path
+    ]
+    try:
+        run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise PipelineError(f"Error extracting audio: {e.stderr.decode(errors='replace')}") from e
+
+
+@metrics.timed("split_audio")
+def split_audio(audio_path, output_dir, chunk_seconds):
+    """
+    Split an audio file into chunks of about chunk_seconds without
+    re-encoding. Returns the chunk paths in order.
+    """
+    extension = os.path.splitext(audio_path)[1]
+    pattern = os.path.join(output_dir, f"chunk_%03d{extension}")
+    command = [
+        "ffmpeg", "-y",
+        "-i", audio_path,
+        "-f", "segment",
+        "-segment_time", str(chunk_seconds),
+        "-c", "copy",
+        pattern
+    ]
+    try:
+        run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise PipelineError(f"Error splitting audio: {e.stderr.decode(errors='replace')}") from e
+    return sorted(
+        os.path.join(output_dir, name) for name in os.listdir(output_dir)
+        if name.startswith("chunk_") and name.endswith(extension)
+    )
+
+
+@metrics.timed("transcribe")
+def transcribe_audio(audio_path, backend=None, model_name='gemini-2.0-flash'):
+    """
+    Transcribe audio with the configured speech-to-text backend.
+    Returns a transcribers.Transcript.
+    """
+    try:
+        return resources.transcriber(backend, model_name).transcribe(audio_path)
+    except Exception as e:
+        raise PipelineError(f"Error during transcription: {e}") from e
+
+
+def is_english(text):
+    """
+    Check if the given text is in English
+    """
+    import langdetect
+    try:
+        return langdetect.detect(text) == 'en'
+    except Exception:
+        return False
+
+
+@metrics.timed("translate")
+def translate_content(content, target_language, backend=None, model_name='gemini-2.0-flash', **options):
+    """
+    Translate SRT (or plain text) content with the configured translation backend.
+    """
+    try:
+        return resources.translator(backend, model_name).translate_srt(content, target_language, **options)
+    except Exception as e:
+        raise PipelineError(f"Error during translation: {e}") from e
+
+
+def subtitles_filter(subtitle_path):
+    """
+    ffmpeg `subtitles` filter argument with the path escaped for the filter graph.
+    """
+    path = subtitle_path.replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+    return f"subtitles='{path}'"
+
+
+@metrics.timed("burn_subtitles")
+def burn_subtitles_into_video(video_path, subtitle_path, output_path):
+    """
+    Burns subtitles into a video using ffmpeg.
+    """
+    command = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-vf", subtitles_filter(subtitle_path),
+        "-c:a", "copy",
+        output_path
+    ]
+    try:
+        run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise PipelineError(f"Error burning subtitles: {e.stderr.decode(errors='replace')}") from e
+
+
+@metrics.timed("download")
+def download_video(url, output_dir):
+    """
+    Download a video (YouTube or any yt-dlp supported site) into output_dir.
+    Returns (video_path, title).
+    """
+    import yt_dlp
+    ydl_opts = {
+        'format': 'best[ext=mp4]/best',
+        'outtmpl': os.path.join(output_dir, '%(id)s.%(ext)s'),
+        'quiet': True,
+        'no_warnings': True,
+        'noplaylist': True,
+    }
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            return ydl.prepare_filename(info), info.get('title')
+    except Exception as e:
+        raise PipelineError(f"Error downloading video: {e}") from e
+
+
+def expand_urls(url):
+    """
+    Expand a playlist/channel URL into its video URLs; other URLs are
+    returned unchanged.
+    """
+    import yt_dlp
+    ydl_opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist'}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if info.get('_type') != 'playlist':
+        return [url]
+    return [entry.get('url') or entry.get('webpage_url') for entry in info.get('entries') or [] if entry]
+
+
+def language_slug(target_language):
+    """File-name friendly form of a language name."""
+    return target_language.lower().replace(' ', '_').replace('(', '').replace(')', '')
+
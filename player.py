@@ -0,0 +1,205 @@
+"""
+Browser-side subtitles: show our VTT tracks over the video instead of
+burning them in, so watching the result needs no server-side encode.
+
+Both players take tracks as {label: WebVTT text} and add a language
+switcher. Each returns an HTML document for
+``streamlit.components.v1.html``:
+
+    tracks = player.tracks_from_srt({"English": original_srt, "French": translated_srt})
+
+    st.video(video_path)
+    components.html(player.attach_tracks(tracks, selected="French"), height=TRACK_BAR_HEIGHT)
+
+    components.html(player.youtube_player(video_id, tracks), height=YOUTUBE_PLAYER_HEIGHT)
+
+``attach_tracks`` adds <track> elements to the st.video element rendered
+just before the component (component iframes are same-origin with the
+app), so the browser's own caption rendering is used, fullscreen included.
+``youtube_player`` embeds the video with the YouTube IFrame API and draws
+the active cue over it, following the player's current time.
+"""
+import html
+import json
+import string
+
+from subtitles import parse_srt, segments_to_vtt
+
+TRACK_BAR_HEIGHT = 48
+YOUTUBE_PLAYER_HEIGHT = 460
+# How often the YouTube overlay follows the player's position
+YOUTUBE_POLL_MS = 100
+
+_SWITCHER_STYLE = """
+  body { margin: 0; font-family: sans-serif; font-size: 14px; }
+  .bar { display: flex; align-items: center; gap: 0.5rem; padding: 0.5rem 0; }
+  select { padding: 0.25rem 0.5rem; border-radius: 0.375rem; border: 1px solid #CBD5E1; }
+"""
+
+_ATTACH_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html><head><style>$style</style></head>
+<body>
+<div class="bar"><label for="track">$label</label><select id="track"></select></div>
+<script>
+(function () {
+  var tracks = $tracks;
+  var selected = $selected;
+  var select = document.getElementById("track");
+  var parent = window.parent;
+  var host = window.frameElement;
+  // The last video before this component is the one rendered just above it
+  var videos = Array.prototype.filter.call(parent.document.querySelectorAll("video"), function (video) {
+    return video.compareDocumentPosition(host) & Node.DOCUMENT_POSITION_FOLLOWING;
+  });
+  var video = videos[videos.length - 1];
+  if (!video) {
+    select.disabled = true;
+    return;
+  }
+  // Reruns render the component again; replace the tracks added last time
+  Array.prototype.forEach.call(video.querySelectorAll("track[data-overlay]"), function (track) {
+    parent.URL.revokeObjectURL(track.src);
+    track.remove();
+  });
+  var elements = Object.keys(tracks).map(function (label) {
+    var track = parent.document.createElement("track");
+    track.kind = "subtitles";
+    track.label = label;
+    track.dataset.overlay = "";
+    track.src = parent.URL.createObjectURL(new parent.Blob([tracks[label]], {type: "text/vtt"}));
+    video.appendChild(track);
+    select.add(new Option(label, label));
+    return track;
+  });
+  select.add(new Option($off_label, ""));
+  function show(label) {
+    elements.forEach(function (track) {
+      track.track.mode = track.label === label ? "showing" : "disabled";
+    });
+  }
+  select.value = selected in tracks ? selected : select.options[0].value;
+  select.addEventListener("change", function () { show(select.value); });
+  show(select.value);
+})();
+</script>
+</body></html>
+""")
+
+_YOUTUBE_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html><head><style>$style
+  .player { position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: 10px; background: #000; }
+  .player iframe { position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: 0; }
+  .caption { position: absolute; left: 50%; bottom: 10%; transform: translateX(-50%); max-width: 90%;
+             padding: 0.2em 0.5em; background: rgba(0, 0, 0, 0.75); color: #FFF; font-size: 1.4em;
+             line-height: 1.3; text-align: center; white-space: pre-line; pointer-events: none; }
+  .caption:empty { display: none; }
+</style></head>
+<body>
+<div class="player"><div id="video"></div><div id="caption" class="caption"></div></div>
+<div class="bar"><label for="track">$label</label><select id="track"></select></div>
+<script>
+var tracks = $tracks;
+var selected = $selected;
+var caption = document.getElementById("caption");
+var select = document.getElementById("track");
+var decoder = document.createElement("textarea");
+var cues = [];
+
+function parseTime(value) {
+  return value.split(":").reduce(function (total, part) { return total * 60 + parseFloat(part); }, 0);
+}
+
+function parseVtt(vtt) {
+  var parsed = [];
+  vtt.replace(/\\r/g, "").split(/\\n\\n+/).forEach(function (block) {
+    var lines = block.split("\\n");
+    var timing = lines.findIndex(function (line) { return line.indexOf("-->") !== -1; });
+    if (timing === -1) {
+      return;
+    }
+    var times = lines[timing].split("-->");
+    // Cue text may contain tags and entities; the overlay shows plain text
+    decoder.innerHTML = lines.slice(timing + 1).join("\\n").replace(/<[^>]*>/g, "");
+    parsed.push({
+      start: parseTime(times[0].trim()),
+      end: parseTime(times[1].trim().split(/\\s+/)[0]),
+      text: decoder.value,
+    });
+  });
+  return parsed.sort(function (a, b) { return a.start - b.start; });
+}
+
+function cueAt(time) {
+  // Last cue starting at or before time
+  var low = 0, high = cues.length;
+  while (low < high) {
+    var middle = (low + high) >> 1;
+    if (cues[middle].start <= time) { low = middle + 1; } else { high = middle; }
+  }
+  var cue = cues[low - 1];
+  return cue && cue.end > time ? cue.text : "";
+}
+
+Object.keys(tracks).forEach(function (label) { select.add(new Option(label, label)); });
+select.add(new Option($off_label, ""));
+function show(label) {
+  cues = label ? parseVtt(tracks[label]) : [];
+  caption.textContent = "";
+}
+select.value = selected in tracks ? selected : select.options[0].value;
+select.addEventListener("change", function () { show(select.value); });
+show(select.value);
+
+function onYouTubeIframeAPIReady() {
+  new YT.Player("video", {
+    videoId: $video_id,
+    // No fullscreen button: the overlay lives in this page, outside YouTube's fullscreen element
+    playerVars: {fs: 0, rel: 0, playsinline: 1, cc_load_policy: 0, iv_load_policy: 3},
+    events: {
+      onReady: function (event) {
+        setInterval(function () {
+          var text = cueAt(event.target.getCurrentTime());
+          if (caption.textContent !== text) {
+            caption.textContent = text;
+          }
+        }, $poll_ms);
+      },
+    },
+  });
+}
+</script>
+<script src="https://www.youtube.com/iframe_api"></script>
+</body></html>
+""")
+
+
+def _js(value):
+    # JSON is valid JavaScript; "</" would end the <script> element early
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def tracks_from_srt(srt_by_label):
+    """{label: SRT content} -> {label: WebVTT content}, for the players."""
+    return {label: segments_to_vtt(parse_srt(content)) for label, content in srt_by_label.items()}
+
+
+def attach_tracks(tracks, selected=None, label="Subtitles", off_label="Off"):
+    """
+    HTML that adds `tracks` ({label: WebVTT}) to the video rendered just
+    before it, with a switcher showing `selected` (default: the first).
+    """
+    return _ATTACH_TEMPLATE.substitute(
+        style=_SWITCHER_STYLE, label=html.escape(label), tracks=_js(tracks), selected=_js(selected),
+        off_label=_js(off_label),
+    )
+
+
+def youtube_player(video_id, tracks, selected=None, label="Subtitles", off_label="Off"):
+    """
+    HTML for a YouTube embed with `tracks` ({label: WebVTT}) drawn over it
+    and a switcher showing `selected` (default: the first).
+    """
+    return _YOUTUBE_TEMPLATE.substitute(
+        style=_SWITCHER_STYLE, label=html.escape(label), tracks=_js(tracks), selected=_js(selected),
+        off_label=_js(off_label), video_id=_js(video_id), poll_ms=YOUTUBE_POLL_MS,
+    )
@@ -0,0 +1,165 @@
+"""
+Opt-in profiling of a single job.
+
+    with profiling.JobProfile() as profile:
+        ...                                   # run the job in this thread
+    paths = profile.save(output_dir, "talk")
+
+While active, a profile records three things:
+
+- a cProfile trace of the calling thread, saved as ``<name>_profile.prof`` (pstats format, opens
+  in snakeviz, ``python -m pstats`` or ``pyinstrument --load-prof``)
+- stack samples of the calling thread taken every few milliseconds, saved as folded stacks in
+  ``<name>_profile.folded`` (flamegraph.pl, speedscope, inferno)
+- wall time of every ffmpeg/ffprobe command the job runs, saved with a
+  summary in ``<name>_profile.json``. Commands run by worker threads count
+  too when the task is submitted through ``propagate``:
+
+    pool.submit(profiling.propagate(render_segment), ...)
+
+Enable it per job (``run_job(..., profile=True)``, ``batch.py --profile``,
+``"profile": true`` in API requests) or for everything with PROFILE_JOBS=1.
+"""
+import collections
+import contextvars
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_JOBS = os.getenv("PROFILE_JOBS", "").lower() in ("1", "true", "yes")
+SAMPLE_INTERVAL_SECONDS = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Profile of the running job; tasks wrapped with propagate() see it too
+_active = contextvars.ContextVar("active_profile", default=None)
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread from a background thread and counts
+    identical stacks (folded-stack format).
+    """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class JobProfile:
+    """
+    Profile of the calling thread for the duration of a with-block.
+    """
+
+    def __init__(self, sample_interval=SAMPLE_INTERVAL_SECONDS):
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), sample_interval)
+        self.commands = []
+        self.wall_seconds = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._token = _active.set(self)
+        self.sampler.start()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile at a time; keep sampling only
+            self.profiler = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.sampler.stop()
+        _active.reset(self._token)
+        self.wall_seconds = time.perf_counter() - self._start
+        return False
+
+    def record_command(self, command, seconds, returncode):
+        # Called from the job's worker threads too; list.append is atomic
+        self.commands.append({
+            "program": os.path.basename(command[0]),
+            "command": " ".join(command),
+            "seconds": round(seconds, 4),
+            "returncode": returncode,
+        })
+
+    def summary(self):
+        by_program = collections.defaultdict(float)
+        for entry in self.commands:
+            by_program[entry["program"]] += entry["seconds"]
+        subprocess_seconds = sum(by_program.values())
+        return {
+            "wall_seconds": round(self.wall_seconds or 0, 4),
+            "subprocess_seconds": {program: round(seconds, 4) for program, seconds in by_program.items()},
+            # Commands run in parallel can add up to more than the wall time
+            "python_seconds": round(max(0, (self.wall_seconds or 0) - subprocess_seconds), 4),
+            "samples": sum(self.sampler.stacks.values()),
+            "commands": self.commands,
+        }
+
+    def save(self, output_dir, name):
+        """Write the profile files and return their paths by kind."""
+        paths = {
+            "flamegraph": os.path.join(output_dir, f"{name}_profile.folded"),
+            "profile_summary": os.path.join(output_dir, f"{name}_profile.json"),
+        }
+        if self.profiler is not None:
+            paths["profile"] = os.path.join(output_dir, f"{name}_profile.prof")
+            self.profiler.dump_stats(paths["profile"])
+        with open(paths["flamegraph"], "w", encoding="utf-8") as f:
+            f.write(self.sampler.folded())
+        with open(paths["profile_summary"], "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return paths
+
+
+def propagate(fn):
+    """
+    fn wrapped to run in a copy of the caller's context, so that subprocesses
+    it runs on a worker thread are recorded by the caller's active profile.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can be entered by one thread at a time; pools run several calls at once
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def record_command(command, seconds, returncode):
+    """Report a finished subprocess to the active profile, if any."""
+    profile = _active.get()
+    if profile is not None:
+        profile.record_command(command, seconds, returncode)
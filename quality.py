@@ -0,0 +1,91 @@
+"""
+Translation quality tiers.
+
+A tier is a performance profile, not just a temperature: it picks the model,
+how many lines go in a request, how many requests run at once, how many
+validation retries a batch gets and which lines get a review pass.
+
+    translator = quality.translator("fast")
+    translator.translate_srt(content, "French")
+
+The fast tier trades accuracy for latency (a lighter model, small batches,
+many requests in flight, no retries); the accurate tier uses a stronger
+model with fewer requests in flight, and sends the lines that fail the
+checks in verification.py back for review. Compare them with
+``python bench_pipeline.py --quality <tier>``.
+"""
+import os
+
+import resources
+
+
+class QualityTier:
+    """
+    Model and request settings for one quality level.
+    """
+
+    def __init__(self, name, model_name, temperature, batch_size, concurrency, context_lines,
+                 validation_passes, review):
+        self.name = name
+        self.model_name = model_name
+        self.temperature = temperature
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.context_lines = context_lines
+        self.validation_passes = validation_passes
+        self.review = review
+
+    def translator_options(self):
+        return {
+            "batch_size": self.batch_size,
+            "temperature": self.temperature,
+            "context_lines": self.context_lines,
+            "concurrency": self.concurrency,
+            "validation_passes": self.validation_passes,
+            "review": self.review,
+        }
+
+
+TIERS = {
+    "fast": QualityTier("fast", "gemini-2.0-flash-lite", temperature=0.4, batch_size=80, concurrency=8,
+                        context_lines=0, validation_passes=0, review=False),
+    "balanced": QualityTier("balanced", "gemini-2.0-flash", temperature=0.2, batch_size=150, concurrency=4,
+                            context_lines=2, validation_passes=1, review=False),
+    "accurate": QualityTier("accurate", "gemini-2.5-flash", temperature=0.1, batch_size=60, concurrency=2,
+                            context_lines=3, validation_passes=2, review="flagged"),
+}
+
+# Labels of the quality slider in the French UI
+TIER_LABELS = {
+    "Rapide": "fast",
+    "Équilibrée": "balanced",
+    "Précise": "accurate",
+}
+
+DEFAULT_TIER = os.getenv("QUALITY_TIER", "balanced")
+
+
+def get_tier(name=None):
+    """Tier by name or UI label (default: QUALITY_TIER, then "balanced")."""
+    name = name or DEFAULT_TIER
+    name = TIER_LABELS.get(name, name)
+    if name not in TIERS:
+        raise ValueError(f"Unknown quality tier: {name}")
+    return TIERS[name]
+
+
+@resources.resource
+def translator(name=None, backend=None):
+    """
+    Translator configured for a tier. Tiers only apply to Gemini; other
+    backends are returned as configured.
+    """
+    from translators import GeminiTranslator
+
+    tier = get_tier(name)
+    backend = backend or os.getenv("TRANSLATOR_BACKEND", "gemini")
+    if backend != "gemini":
+        return resources.translator(backend)
+    return GeminiTranslator(
+        model=resources.gemini_model(tier.model_name), model_name=tier.model_name, **tier.translator_options()
+    )
@@ -0,0 +1,231 @@
+"""
+Subtitle burn-in: parallel segments, quick previews and background renders.
+
+One ffmpeg process stops scaling long before it uses every core: the
+subtitle filter runs on a single thread and x264's frame threads saturate.
+``burn_subtitles`` splits the video at keyframes, burns each segment's
+slice of the subtitles (shifted to start at zero) in its own ffmpeg
+process, joins the segments with the concat demuxer and copies the
+original audio once at the end:
+
+    render.burn_subtitles(video_path, "talk_french.srt", "talk_translated.mp4")
+
+Videos shorter than two segments, and RENDER_WORKERS=1, use the
+single-process pipeline.burn_subtitles_into_video. RENDER_VIDEO_ARGS sets
+the encoder (default libx264, CRF 23), so a hardware encoder such as
+h264_nvenc, h264_qsv or h264_videotoolbox can be swapped in; every segment
+uses the same settings, which the concat demuxer requires.
+
+For interactive use, ``render_preview`` makes a low-resolution ultrafast
+proxy (optionally only the first PREVIEW_SECONDS) that can be shown right
+away, and ``render_in_background`` finishes the full-quality render off the
+request path and publishes it to the artifact store:
+
+    render.render_preview(video_path, srt_path, preview_path)
+    future = render.render_in_background(video_path, srt_path, "talk_translated.mp4", job_id)
+"""
+import bisect
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import artifacts
+import metrics
+import pipeline
+import profiling
+import resources
+import workspace
+from subtitles import parse_srt, segments_to_srt
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 1)))
+VIDEO_ARGS = shlex.split(os.getenv("RENDER_VIDEO_ARGS", "-c:v libx264 -preset medium -crf 23 -pix_fmt yuv420p"))
+MIN_SEGMENT_SECONDS = float(os.getenv("RENDER_MIN_SEGMENT_SECONDS", "30"))
+# More segments than workers, so a slow segment doesn't leave cores idle at the end
+SEGMENTS_PER_WORKER = 2
+
+PREVIEW_HEIGHT = int(os.getenv("PREVIEW_HEIGHT", "360"))
+# 0 renders the whole video
+PREVIEW_SECONDS = float(os.getenv("PREVIEW_SECONDS", "0"))
+PREVIEW_VIDEO_ARGS = ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "30", "-pix_fmt", "yuv420p"]
+BACKGROUND_RENDERS = int(os.getenv("BACKGROUND_RENDERS", "1"))
+
+
+def keyframe_times(video_path):
+    """Timestamps of the video's keyframes, read from packet flags without decoding."""
+    command = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path]
+    try:
+        output = pipeline.run_command(command).stdout.decode()
+    except subprocess.CalledProcessError as e:
+        raise pipeline.PipelineError(f"Error reading keyframes: {e.stderr.decode(errors='replace')}") from e
+    times = []
+    for line in output.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            times.append(float(pts_time))
+    return sorted(times)
+
+
+def split_points(keyframes, duration, count, min_segment=MIN_SEGMENT_SECONDS):
+    """
+    Boundaries [0, k1, ..., duration] of up to `count` segments, each cut
+    at the keyframe nearest to an even split that leaves both sides at
+    least min_segment long.
+    """
+    count = max(1, min(count, int(duration // min_segment)))
+    boundaries = [0.0]
+    for i in range(1, count):
+        target = duration * i / count
+        # Keyframes in order of distance to the target, from both sides
+        before, after = bisect.bisect_left(keyframes, target) - 1, bisect.bisect_left(keyframes, target)
+        while before >= 0 or after < len(keyframes):
+            if after >= len(keyframes) or (before >= 0 and target - keyframes[before] <= keyframes[after] - target):
+                point = keyframes[before]
+                before -= 1
+            else:
+                point = keyframes[after]
+                after += 1
+            if point - boundaries[-1] >= min_segment and duration - point >= min_segment:
+                boundaries.append(point)
+                break
+    boundaries.append(duration)
+    return boundaries
+
+
+def subtitle_slice(segments, start, end):
+    """Cues visible in [start, end), clipped to it and shifted to start at zero."""
+    return [
+        (max(cue_start, start) - start, min(cue_end, end) - start, text)
+        for cue_start, cue_end, text in segments
+        if cue_end > start and cue_start < end
+    ]
+
+
+def _render_segment(video_path, start, end, subtitle_path, output_path, threads):
+    command = [
+        "ffmpeg", "-y",
+        # Input seeking to a keyframe: fast, exact, and timestamps restart at zero
+        "-ss", f"{start:.6f}", "-i", video_path,
+        "-t", f"{end - start:.6f}",
+        "-vf", pipeline.subtitles_filter(subtitle_path),
+        "-an", *VIDEO_ARGS, "-threads", str(threads),
+        output_path,
+    ]
+    pipeline.run_command(command)
+
+
+@metrics.timed("burn_subtitles_segmented")
+def burn_subtitles_segmented(video_path, subtitle_path, output_path, boundaries, workers):
+    """Burn subtitles into each segment in parallel and join the results."""
+    with open(subtitle_path, encoding="utf-8") as f:
+        cues = parse_srt(f.read())
+    work_dir = tempfile.mkdtemp(prefix="render-", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        jobs = []
+        for i, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+            slice_path = os.path.join(work_dir, f"segment_{i:03d}.srt")
+            with open(slice_path, "w", encoding="utf-8") as f:
+                f.write(segments_to_srt(subtitle_slice(cues, start, end)))
+            jobs.append((start, end, slice_path, os.path.join(work_dir, f"segment_{i:03d}.mp4")))
+
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        render_segment = profiling.propagate(_render_segment)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render") as pool:
+            futures = [pool.submit(render_segment, video_path, start, end, slice_path, segment_path, threads)
+                       for start, end, slice_path, segment_path in jobs]
+            for future in futures:
+                future.result()
+
+        list_path = os.path.join(work_dir, "segments.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for *_, segment_path in jobs:
+                f.write("file '{}'\n".format(segment_path.replace("'", "'\\''")))
+        pipeline.run_command([
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", video_path,
+            "-map", "0:v", "-map", "1:a?",
+            "-c", "copy", "-movflags", "+faststart",
+            output_path,
+        ])
+    except subprocess.CalledProcessError as e:
+        raise pipeline.PipelineError(f"Error burning subtitles: {e.stderr.decode(errors='replace')}") from e
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def burn_subtitles(video_path, subtitle_path, output_path, workers=None):
+    """
+    Burn subtitles into the video, in parallel segments when the video is
+    long enough and more than one worker is allowed.
+    """
+    workers = workers or RENDER_WORKERS
+    if workers > 1:
+        duration = pipeline.check_video_duration(video_path)
+        if duration >= 2 * MIN_SEGMENT_SECONDS:
+            boundaries = split_points(keyframe_times(video_path), duration, workers * SEGMENTS_PER_WORKER)
+            if len(boundaries) > 2:
+                burn_subtitles_segmented(video_path, subtitle_path, output_path, boundaries,
+                                         min(workers, len(boundaries) - 1))
+                return
+    pipeline.burn_subtitles_into_video(video_path, subtitle_path, output_path)
+
+
+@metrics.timed("burn_preview")
+def render_preview(video_path, subtitle_path, output_path, height=PREVIEW_HEIGHT, max_seconds=PREVIEW_SECONDS):
+    """
+    Burn subtitles into a small, quickly encoded proxy of the video: scaled
+    down to `height` lines (never up) and, with max_seconds, cut short.
+    """
+    command = ["ffmpeg", "-y", "-i", video_path]
+    if max_seconds:
+        command += ["-t", str(max_seconds)]
+    command += [
+        # Scale first so the subtitle filter also works on the small frames
+        "-vf", f"scale=-2:'min({height},ih)',{pipeline.subtitles_filter(subtitle_path)}",
+        *PREVIEW_VIDEO_ARGS,
+        "-c:a", "aac", "-b:a", "64k", "-movflags", "+faststart",
+        output_path,
+    ]
+    try:
+        pipeline.run_command(command)
+    except subprocess.CalledProcessError as e:
+        raise pipeline.PipelineError(f"Error rendering the preview: {e.stderr.decode(errors='replace')}") from e
+
+
+@resources.resource
+def background_executor():
+    """Pool for full-quality renders that finish after the request that started them."""
+    return ThreadPoolExecutor(max_workers=BACKGROUND_RENDERS, thread_name_prefix="background-render")
+
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def render_in_background(video_path, subtitle_path, output_name, job_id):
+    """
+    Queue the full-quality burn and return a Future for the published
+    artifact path (see artifacts.py). The inputs are linked into a
+    workspace owned by the render, so the caller's workspace may be
+    removed as soon as this returns.
+    """
+    owned = workspace.Workspace()
+    video = owned.file(os.path.basename(video_path))
+    _link_or_copy(video_path, video)
+    subtitles = owned.file(os.path.basename(subtitle_path))
+    _link_or_copy(subtitle_path, subtitles)
+
+    def run():
+        with owned:
+            output_path = owned.file(output_name)
+            burn_subtitles(video, subtitles, output_path)
+            return artifacts.store().publish(job_id, output_path)
+
+    return background_executor().submit(run)
@@ -0,0 +1,75 @@
+"""
+Process-wide registry of heavy clients.
+
+Streamlit re-executes the app script on every interaction, but imported
+modules stay cached in the process. Clients built here are therefore created
+once on first use and shared by every rerun, session and thread. The same
+registry works for the CLI and the HTTP API.
+"""
+import functools
+import os
+import threading
+
+import metrics
+
+_registry = {}
+_lock = threading.Lock()
+
+
+def resource(func):
+    """
+    Decorator: build the resource once per distinct set of arguments and
+    return the cached instance afterwards. Construction is serialized so
+    concurrent sessions don't build the same client twice.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        try:
+            value = _registry[key]
+            metrics.CACHE_REQUESTS.inc(cache="resources", result="hit")
+            return value
+        except KeyError:
+            pass
+        with _lock:
+            if key not in _registry:
+                metrics.CACHE_REQUESTS.inc(cache="resources", result="miss")
+                _registry[key] = func(*args, **kwargs)
+            else:
+                metrics.CACHE_REQUESTS.inc(cache="resources", result="hit")
+            return _registry[key]
+    return wrapper
+
+
+def clear():
+    """Drop every cached resource (e.g. after rotating API keys)."""
+    with _lock:
+        _registry.clear()
+
+
+@resource
+def gemini_model(model_name='gemini-2.0-flash'):
+    """Configured Gemini model client."""
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(model_name)
+
+
+@resource
+def transcriber(backend=None, model_name='gemini-2.0-flash'):
+    """Speech-to-text backend; Gemini shares the cached model client."""
+    from transcribers import GeminiTranscriber, get_transcriber
+    backend = backend or os.getenv("TRANSCRIBER_BACKEND", "gemini")
+    if backend == "gemini":
+        return GeminiTranscriber(model=gemini_model(model_name))
+    return get_transcriber(backend)
+
+
+@resource
+def translator(backend=None, model_name='gemini-2.0-flash'):
+    """Translation backend; Gemini shares the cached model client."""
+    from translators import GeminiTranslator, get_translator
+    backend = backend or os.getenv("TRANSLATOR_BACKEND", "gemini")
+    if backend == "gemini":
+        return GeminiTranslator(model=gemini_model(model_name), model_name=model_name)
+    return get_translator(backend)
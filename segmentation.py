@@ -0,0 +1,203 @@
+"""
+Subtitle layout: line breaking, cue splitting/merging and reading speed.
+
+Transcripts and translations come out as one cue per sentence, however long
+it is. ``reflow`` turns any (start, end, text) cue list into cues that fit
+the target language's limits:
+
+- at most ``max_chars`` per line and ``max_lines`` lines per cue, with line
+  breaks chosen by dynamic programming (balanced lines, breaks after
+  punctuation preferred) in time linear in the cue length
+- at most ``max_cps`` characters per second, by merging cues that flash by
+  and borrowing time from the gaps around a cue
+- CJK text is broken between characters and measured per character; Latin
+  text is broken between words, with wide characters counting double
+
+    cues = reflow(segments, "Japanese")
+"""
+import math
+import re
+import unicodedata
+
+
+class LayoutRules:
+    """
+    Readability limits for one language.
+    """
+
+    def __init__(self, max_chars=42, max_lines=2, max_cps=17.0, min_duration=0.833,
+                 max_duration=7.0, break_chars=False):
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.max_cps = max_cps
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        # True for scripts written without spaces (Chinese, Japanese)
+        self.break_chars = break_chars
+
+
+LATIN_RULES = LayoutRules()
+LANGUAGE_RULES = {
+    "Chinese": LayoutRules(max_chars=16, max_cps=9.0, break_chars=True),
+    "Chinese (Simplified)": LayoutRules(max_chars=16, max_cps=9.0, break_chars=True),
+    "Japanese": LayoutRules(max_chars=13, max_cps=4.0, break_chars=True),
+    "Korean": LayoutRules(max_chars=16, max_cps=12.0),
+    "Arabic": LayoutRules(max_chars=42, max_cps=17.0),
+    "Hindi": LayoutRules(max_chars=42, max_cps=17.0),
+}
+
+BREAK_AFTER_RE = re.compile(r"[,.;:!?、。，；：！？]$")
+# Characters that must not start a line (kinsoku shori)
+NO_LINE_START = set("、。，．・：；？！ー）」』】〕〉》’”)]},.!?;:")
+LINE_PENALTY = 40
+PUNCTUATION_BONUS = 30
+MIN_GAP_SECONDS = 0.083
+
+
+def rules_for(language=None):
+    return LANGUAGE_RULES.get(language, LATIN_RULES) if language else LATIN_RULES
+
+
+def text_width(text, rules=LATIN_RULES):
+    """Width of text in the language's character units."""
+    if rules.break_chars:
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def tokenize(text, rules=LATIN_RULES):
+    """Breakable units of the text: words, or characters for CJK."""
+    if not rules.break_chars:
+        return text.split()
+    tokens = []
+    for char in re.sub(r"\s+", "", text):
+        # Keep closing punctuation with the previous character
+        if tokens and char in NO_LINE_START:
+            tokens[-1] += char
+        else:
+            tokens.append(char)
+    return tokens
+
+
+def break_lines(tokens, rules=LATIN_RULES):
+    """
+    Split tokens into lines of at most rules.max_chars, minimizing the sum of
+    squared free space on each line, plus a penalty per line and a bonus for
+    breaking after punctuation. Only lines that fit are considered, so each
+    token looks back over at most max_chars tokens: O(n * max_chars).
+    """
+    if not tokens:
+        return []
+    separator = "" if rules.break_chars else " "
+    widths = [text_width(token, rules) for token in tokens]
+    gap = len(separator)
+    n = len(tokens)
+    best = [0.0] + [math.inf] * n
+    previous = [0] * (n + 1)
+    for end in range(1, n + 1):
+        width = -gap
+        for start in range(end, 0, -1):
+            width += widths[start - 1] + gap
+            # A single token wider than a line still gets a line of its own
+            if width > rules.max_chars and start < end:
+                break
+            slack = max(rules.max_chars - width, 0)
+            cost = best[start - 1] + slack * slack + LINE_PENALTY
+            if end < n and BREAK_AFTER_RE.search(tokens[end - 1]):
+                cost -= PUNCTUATION_BONUS
+            if cost < best[end]:
+                best[end] = cost
+                previous[end] = start - 1
+    lines = []
+    end = n
+    while end > 0:
+        start = previous[end]
+        lines.append(separator.join(tokens[start:end]))
+        end = start
+    return lines[::-1]
+
+
+def layout(text, rules=LATIN_RULES):
+    """Lines of the text, ignoring any existing line breaks."""
+    return break_lines(tokenize(text, rules), rules)
+
+
+def split_cue(start, end, text, rules=LATIN_RULES):
+    """
+    Split one cue into cues of at most rules.max_lines lines, sharing the
+    cue's time in proportion to the amount of text in each.
+    """
+    lines = layout(text, rules)
+    if len(lines) <= rules.max_lines:
+        return [(start, end, "\n".join(lines))]
+
+    groups = [lines[i:i + rules.max_lines] for i in range(0, len(lines), rules.max_lines)]
+    # Re-balance each group's lines now that its text is known
+    texts = [("" if rules.break_chars else " ").join(group) for group in groups]
+    total = sum(text_width(t, rules) for t in texts) or 1
+    cues, position = [], start
+    for i, group_text in enumerate(texts):
+        piece_end = end if i == len(texts) - 1 else position + (end - start) * text_width(group_text, rules) / total
+        cues.append((position, piece_end, "\n".join(layout(group_text, rules))))
+        position = piece_end
+    return cues
+
+
+def _reading_time(text, rules):
+    return text_width(text.replace("\n", ""), rules) / rules.max_cps
+
+
+def merge_fast_cues(segments, rules=LATIN_RULES, max_gap=1.0):
+    """
+    Merge neighbouring cues that are too fast to read when the merged cue
+    still fits in rules.max_lines lines and rules.max_duration seconds.
+    """
+    merged = []
+    for start, end, text in segments:
+        if merged:
+            prev_start, prev_end, prev_text = merged[-1]
+            too_fast = (prev_end - prev_start < _reading_time(prev_text, rules)
+                        or end - start < _reading_time(text, rules))
+            combined = f"{prev_text} {text}" if not rules.break_chars else prev_text + text
+            if (too_fast and start - prev_end <= max_gap and end - prev_start <= rules.max_duration
+                    and len(layout(combined, rules)) <= rules.max_lines):
+                merged[-1] = (prev_start, end, combined)
+                continue
+        merged.append((start, end, text))
+    return merged
+
+
+def fix_timing(segments, rules=LATIN_RULES, duration=None):
+    """
+    Extend cues shorter than their reading time (or rules.min_duration)
+    into the free time after and then before them, never overlapping.
+    The last cue never ends after the media `duration` (or, without it,
+    after its original end).
+    """
+    fixed = [list(segment) for segment in segments]
+    for i, cue in enumerate(fixed):
+        start, end, text = cue
+        needed = max(_reading_time(text, rules), rules.min_duration)
+        if end - start >= needed:
+            continue
+        next_start = fixed[i + 1][0] - MIN_GAP_SECONDS if i + 1 < len(fixed) else max(end, duration or end)
+        end = max(end, min(start + needed, next_start))
+        if end - start < needed:
+            prev_end = fixed[i - 1][1] + MIN_GAP_SECONDS if i > 0 else 0.0
+            start = min(start, max(end - needed, prev_end))
+        cue[0], cue[1] = start, end
+    return [tuple(cue) for cue in fixed]
+
+
+def reflow(segments, language=None, rules=None, duration=None):
+    """
+    Re-segment (start, end, text) cues to the language's layout rules.
+    Returned cue texts contain the chosen line breaks. With the media
+    `duration`, the last cue may be extended up to the end of the media.
+    """
+    rules = rules or rules_for(language)
+    segments = [(start, end, " ".join(text.split()) if not rules.break_chars else text.strip())
+                for start, end, text in segments if text.strip()]
+    segments = merge_fast_cues(segments, rules)
+    split = [cue for start, end, text in segments for cue in split_cue(start, end, text, rules)]
+    return fix_timing(split, rules, duration)
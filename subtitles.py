@@ -0,0 +1,235 @@
+import json
+import re
+from xml.sax.saxutils import escape as xml_escape, unescape as xml_unescape
+
+SRT_TIME_RE = re.compile(r'(\d+):(\d{2}):(\d{2})[,.](\d{3})')
+
+
+def format_time(seconds):
+    """Formats seconds into SRT time format (HH:MM:SS,ms)."""
+    total_ms = int(round(seconds * 1000))
+    hours, total_ms = divmod(total_ms, 3600000)
+    minutes, total_ms = divmod(total_ms, 60000)
+    secs, milliseconds = divmod(total_ms, 1000)
+    return f"{hours:02}:{minutes:02}:{secs:02},{milliseconds:03}"
+
+
+def parse_time(time_str):
+    """Parses an SRT/VTT timestamp (HH:MM:SS,ms) into seconds."""
+    match = SRT_TIME_RE.search(time_str)
+    if not match:
+        raise ValueError(f"Invalid timestamp: {time_str}")
+    hours, minutes, secs, milliseconds = (int(g) for g in match.groups())
+    return hours * 3600 + minutes * 60 + secs + milliseconds / 1000
+
+
+def parse_srt(content):
+    """
+    Parses SRT content into (start_seconds, end_seconds, text) segments.
+    Blocks without a valid timing line are skipped.
+    """
+    segments = []
+    for block in re.split(r'\n\s*\n', content.replace('\r\n', '\n').strip()):
+        lines = block.split('\n')
+        for i, line in enumerate(lines):
+            if '-->' in line:
+                start_str, end_str = line.split('-->', 1)
+                try:
+                    start, end = parse_time(start_str), parse_time(end_str)
+                except ValueError:
+                    break
+                text = '\n'.join(l.strip() for l in lines[i + 1:] if l.strip())
+                segments.append((start, end, text))
+                break
+    return segments
+
+
+def text_to_segments(text, duration_seconds):
+    """
+    Splits plain text into sentences and assigns approximate timings
+    spread evenly over the duration.
+    """
+    if not text:
+        return []
+
+    # Split text into sentences or manageable chunks
+    # This regex tries to split by common sentence endings, but keeps the delimiter.
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+
+    if not sentences:
+        return []
+
+    num_sentences = len(sentences)
+    time_per_sentence = duration_seconds / num_sentences if num_sentences > 0 else 0
+
+    segments = []
+    for i, sentence in enumerate(sentences):
+        start_time_seconds = i * time_per_sentence
+        # Ensure end time doesn't exceed total duration
+        end_time_seconds = min((i + 1) * time_per_sentence, duration_seconds)
+        segments.append((start_time_seconds, end_time_seconds, sentence))
+
+    return segments
+
+
+def create_srt_from_text(text, duration_seconds):
+    """
+    Creates a basic SRT string from plain text and total duration.
+    Splits text into sentences and assigns approximate timings.
+    """
+    segments = text_to_segments(text, duration_seconds)
+    if not segments:
+        return ""
+    return segments_to_srt(segments)
+
+
+def segments_to_srt(segments):
+    """
+    Creates an SRT string from (start_seconds, end_seconds, text) segments.
+    """
+    return "".join(iter_srt(segments))
+
+
+def segments_to_vtt(segments):
+    """
+    Creates a WebVTT string from (start_seconds, end_seconds, text) segments.
+    """
+    return "".join(iter_vtt(segments))
+
+
+# Renderers yield the output cue by cue, so a file can be written while it
+# is being rendered and nothing is built twice.
+
+def iter_srt(segments):
+    for i, (start, end, text) in enumerate(segments):
+        separator = "\n" if i else ""
+        yield f"{separator}{i + 1}\n{format_time(start)} --> {format_time(end)}\n{text.strip()}\n"
+
+
+def format_vtt_time(seconds):
+    return format_time(seconds).replace(',', '.')
+
+
+def iter_vtt(segments):
+    yield "WEBVTT\n"
+    for start, end, text in segments:
+        # '<' and '&' start tags and entities in cue text
+        text = text.strip().replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        yield f"\n{format_vtt_time(start)} --> {format_vtt_time(end)}\n{text}\n"
+
+
+def iter_ttml(segments):
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<tt xmlns="http://www.w3.org/ns/ttml" xml:lang="">\n<body>\n<div>\n')
+    for start, end, text in segments:
+        lines = "<br/>".join(xml_escape(line) for line in text.strip().split('\n'))
+        yield f'<p begin="{format_vtt_time(start)}" end="{format_vtt_time(end)}">{lines}</p>\n'
+    yield "</div>\n</body>\n</tt>\n"
+
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 384
+PlayResY: 288
+WrapStyle: 2
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,16,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def format_ass_time(seconds):
+    """ASS timestamps are H:MM:SS.cc (centiseconds)."""
+    total_cs = int(round(seconds * 100))
+    hours, total_cs = divmod(total_cs, 360000)
+    minutes, total_cs = divmod(total_cs, 6000)
+    secs, centiseconds = divmod(total_cs, 100)
+    return f"{hours}:{minutes:02}:{secs:02}.{centiseconds:02}"
+
+
+def iter_ass(segments):
+    yield ASS_HEADER
+    for start, end, text in segments:
+        # Braces start override blocks; newlines are written as \N
+        text = text.strip().replace('{', '\\{').replace('}', '\\}').replace('\n', '\\N')
+        yield f"Dialogue: 0,{format_ass_time(start)},{format_ass_time(end)},Default,,0,0,0,,{text}\n"
+
+
+def iter_json(segments):
+    yield '{"cues": ['
+    for i, (start, end, text) in enumerate(segments):
+        cue = json.dumps({"start": round(start, 3), "end": round(end, 3), "text": text.strip()}, ensure_ascii=False)
+        yield f"{',' if i else ''}\n  {cue}"
+    yield "\n]}\n"
+
+
+# Format -> (file extension, renderer)
+FORMATS = {
+    "srt": (".srt", iter_srt),
+    "vtt": (".vtt", iter_vtt),
+    "ttml": (".ttml", iter_ttml),
+    "ass": (".ass", iter_ass),
+    "json": (".json", iter_json),
+}
+
+
+def parse_vtt(content):
+    """
+    Parses WebVTT content into (start_seconds, end_seconds, text) segments.
+    The header, NOTE and STYLE blocks have no timing line and are skipped.
+    """
+    return [(start, end, xml_unescape(text)) for start, end, text in parse_srt(content)]
+
+
+def parse_ttml(content):
+    """Parses the <p> cues of TTML content into segments."""
+    import xml.etree.ElementTree as ET
+
+    segments = []
+    for p in ET.fromstring(content.encode('utf-8')).iter('{http://www.w3.org/ns/ttml}p'):
+        text = p.text or ''
+        for child in p:
+            text += ('\n' if child.tag.endswith('br') else ''.join(child.itertext())) + (child.tail or '')
+        segments.append((parse_time(p.get('begin')), parse_time(p.get('end')), text))
+    return segments
+
+
+def parse_json(content):
+    """Parses the JSON cue format written by iter_json."""
+    return [(cue["start"], cue["end"], cue["text"]) for cue in json.loads(content)["cues"]]
+
+
+def parse_ass_time(time_str):
+    """Parses an ASS timestamp (H:MM:SS.cc) into seconds."""
+    hours, minutes, secs = time_str.strip().split(':')
+    return int(hours) * 3600 + int(minutes) * 60 + float(secs)
+
+
+def parse_ass(content):
+    """Parses the Dialogue events of ASS content into segments."""
+    segments = []
+    for line in content.replace('\r\n', '\n').split('\n'):
+        if not line.startswith('Dialogue:'):
+            continue
+        # Text is the last of the ten fields and may itself contain commas
+        fields = line[len('Dialogue:'):].split(',', 9)
+        if len(fields) < 10:
+            continue
+        text = fields[9].replace('\\N', '\n').replace('\\{', '{').replace('\\}', '}')
+        segments.append((parse_ass_time(fields[1]), parse_ass_time(fields[2]), text))
+    return segments
+
+
+# Format -> parser of the content written by its renderer
+PARSERS = {
+    "srt": parse_srt,
+    "vtt": parse_vtt,
+    "ttml": parse_ttml,
+    "ass": parse_ass,
+    "json": parse_json,
+}
@@ -0,0 +1,95 @@
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import api
+import workspace
+
+HOUR = 3600
+
+
+def _job(jobs_dir, job_id, status, age):
+    path = jobs_dir / job_id
+    path.mkdir()
+    (path / "job.json").write_text(json.dumps({"id": job_id, "status": status}))
+    modified = time.time() - age
+    os.utime(path, (modified, modified))
+    return path
+
+
+@pytest.fixture
+def swept(tmp_path, monkeypatch):
+    """Job directories left after the janitor's first sweep of a new JobManager."""
+    def start_janitor(root, interval=None, max_age=workspace.STALE_SECONDS, prefix="", in_use=None):
+        # One sweep, in this thread, with the arguments the janitor would get
+        workspace.sweep_stale(root, max_age, prefix, in_use)
+
+    monkeypatch.setattr(workspace, "start_janitor", start_janitor)
+    jobs = {
+        "recent": _job(tmp_path, "a" * 32, "done", workspace.STALE_SECONDS + HOUR),
+        "expired": _job(tmp_path, "b" * 32, "done", api.JOB_RETENTION_SECONDS + HOUR),
+        "failed": _job(tmp_path, "c" * 32, "failed", api.JOB_RETENTION_SECONDS + HOUR),
+        "running": _job(tmp_path, "d" * 32, "running", api.JOB_RETENTION_SECONDS + HOUR),
+    }
+    api.JobManager(str(tmp_path), max_workers=1)
+    return {name for name, path in jobs.items() if path.exists()}
+
+
+def test_retention_covers_artifact_ttl():
+    assert api.JOB_RETENTION_SECONDS >= api.artifacts.ARTIFACT_TTL_SECONDS
+
+
+def test_finished_jobs_kept_while_artifacts_live(swept):
+    assert "recent" in swept
+
+
+def test_expired_jobs_removed(swept):
+    assert "expired" not in swept
+    assert "failed" not in swept
+
+
+def test_pending_jobs_kept(swept):
+    assert "running" in swept
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.quality, "translator", lambda tier=None: None)
+    return api.JobManager(str(tmp_path), max_workers=1)
+
+
+def _run(manager, monkeypatch, run_job):
+    job_id = manager.create()
+    manager.update(job_id, status="queued", language="French")
+    monkeypatch.setattr(api.jobs, "run_job", run_job)
+    manager._run(job_id)
+    return manager.get(job_id), sorted(os.listdir(manager.job_dir(job_id)))
+
+
+def _checkpoint(job_dir):
+    with open(os.path.join(job_dir, "manifest.json"), "w") as f:
+        f.write("{}")
+
+
+def test_failed_job_keeps_its_checkpoints(manager, monkeypatch):
+    def run_job(job_dir, *args, **kwargs):
+        _checkpoint(job_dir)
+        raise api.pipeline.PipelineError("transcription failed")
+
+    job, files = _run(manager, monkeypatch, run_job)
+    assert job["status"] == "failed"
+    assert files == ["job.json", "manifest.json"]
+
+
+def test_succeeded_job_keeps_only_job_json(manager, monkeypatch):
+    def run_job(job_dir, *args, **kwargs):
+        _checkpoint(job_dir)
+        return {}
+
+    job, files = _run(manager, monkeypatch, run_job)
+    assert job["status"] == "done"
+    assert files == ["job.json"]
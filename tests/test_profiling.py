@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+
+
+def _command(i):
+    profiling.record_command(["ffmpeg", "-i", f"segment_{i}.mp4"], 0.5, 0)
+
+
+def test_records_commands_of_propagated_tasks():
+    with profiling.JobProfile() as profile:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(profiling.propagate(_command), range(8)))
+    assert len(profile.commands) == 8
+    assert profile.summary()["subprocess_seconds"] == {"ffmpeg": 4.0}
+
+
+def test_no_profile_outside_the_block():
+    with profiling.JobProfile() as profile:
+        pass
+    _command(0)
+    assert profile.commands == []
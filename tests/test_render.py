@@ -0,0 +1,20 @@
+import render
+
+KEYFRAMES = [0, 10, 20, 31, 45, 60, 62, 90, 120]
+
+
+def test_split_points_look_past_the_nearest_keyframes():
+    # Nearest to the first split (24 s) is 20, too early; 31 is further but fits,
+    # and 45, nearest to the second (48 s), is too close to it
+    assert render.split_points(KEYFRAMES, 120, 5, min_segment=22) == [0.0, 31, 60, 90, 120]
+
+
+def test_split_points_keep_min_segment():
+    boundaries = render.split_points(KEYFRAMES, 120, 4, min_segment=30)
+    assert boundaries == [0.0, 31, 62, 120]
+    assert all(end - start >= 30 for start, end in zip(boundaries, boundaries[1:]))
+
+
+def test_split_points_cut_at_keyframes_only():
+    assert render.split_points([], 120, 4, min_segment=30) == [0.0, 120]
+    assert render.split_points([0, 100], 120, 4, min_segment=30) == [0.0, 120]
@@ -0,0 +1,48 @@
+import pytest
+
+import exporters
+from subtitles import FORMATS, PARSERS
+
+SEGMENTS = [
+    (0.0, 1.234, "Hello, world."),
+    (1.5, 4.007, "Two lines,\nwith a break"),
+    (61.01, 62.999, "Bonjour à tous — ça va ?"),
+    (3723.456, 3725.5, "日本語の字幕です。\nمرحبا بالعالم"),
+    (3725.6, 3730.0, "Tags <b>stay</b> & {braces} too 🎬"),
+]
+
+# Timestamp resolution of each format, in seconds
+PRECISION = {"srt": 0.001, "vtt": 0.001, "ttml": 0.001, "json": 0.001, "ass": 0.01}
+
+
+def _ticks(seconds, precision):
+    return round(seconds / precision)
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    base_path = tmp_path_factory.mktemp("export") / "talk_french"
+    return exporters.export(SEGMENTS, str(base_path), list(FORMATS))
+
+
+def test_export_writes_every_format(exported):
+    assert set(exported) == set(FORMATS)
+    for fmt, path in exported.items():
+        assert path.endswith(FORMATS[fmt][0])
+
+
+@pytest.mark.parametrize("fmt", sorted(FORMATS))
+def test_round_trip(exported, fmt):
+    with open(exported[fmt], encoding="utf-8") as f:
+        parsed = PARSERS[fmt](f.read())
+
+    precision = PRECISION[fmt]
+    expected = [(_ticks(start, precision), _ticks(end, precision), text) for start, end, text in SEGMENTS]
+    assert [(_ticks(start, precision), _ticks(end, precision), text) for start, end, text in parsed] == expected
+
+
+def test_ass_rounds_to_centiseconds(exported):
+    with open(exported["ass"], encoding="utf-8") as f:
+        parsed = PARSERS["ass"](f.read())
+    assert parsed[0][1] == pytest.approx(1.23)
+    assert parsed[3][0] == pytest.approx(3723.46)
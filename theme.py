@@ -0,0 +1,107 @@
+"""
+Stylesheets and shared HTML snippets for the Streamlit apps.
+
+The CSS lives in static/ as plain files, read once per process. Each
+stylesheet is sent to a browser session once: a zero-height component
+puts it in a <style> element of the page's <head>, which Streamlit reruns
+leave alone (elements in the app body would be removed by the next rerun
+that doesn't send them again). Later reruns send nothing unless the theme
+changes, and then only the new theme's CSS. Streamlit's static file server
+can't be used instead, since it serves .css files as text/plain with
+nosniff and browsers refuse them as stylesheets.
+"""
+import functools
+import json
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+BASE_STYLESHEET = "style.css"
+
+# Theme choice -> extra stylesheet layered on top of the base one
+THEMES = {
+    "Bleu (Défaut)": None,
+    "Sombre": "theme-sombre.css",
+    "Clair": "theme-clair.css",
+}
+
+# Session state key: {slot: stylesheet currently in the page head}
+INJECTED_KEY = "_theme_stylesheets"
+
+_INJECT_SCRIPT = """<script>
+(function () {
+  var doc = window.parent.document;
+  var id = %s, css = %s;
+  var style = doc.getElementById(id);
+  if (css === null) {
+    if (style) { style.remove(); }
+    return;
+  }
+  if (!style) {
+    style = doc.createElement("style");
+    style.id = id;
+    doc.head.appendChild(style);
+  }
+  style.textContent = css;
+})();
+</script>"""
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet(filename):
+    """Content of a stylesheet in static/, read once."""
+    with open(os.path.join(STATIC_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+def _apply(slot, filename):
+    """Put the stylesheet (or nothing, for None) in the head's slot, once per session."""
+    injected = st.session_state.setdefault(INJECTED_KEY, {})
+    if injected.get(slot) == filename:
+        # Already in the page head, or nothing to put nor remove
+        injected[slot] = filename
+        return
+    css = stylesheet(filename) if filename else None
+    # "</" would end the <script> element early
+    script = _INJECT_SCRIPT % (json.dumps(f"app-style-{slot}"), json.dumps(css).replace("</", "<\\/"))
+    components.html(script, height=0)
+    injected[slot] = filename
+
+
+def apply_base_styles():
+    """Apply the base stylesheet."""
+    _apply("base", BASE_STYLESHEET)
+
+
+def apply_theme(theme_name):
+    """Apply the stylesheet of the selected theme (removing the previous one)."""
+    _apply("theme", THEMES.get(theme_name))
+
+
+def stats_card(title, stats):
+    """
+    HTML for a statistics card; `stats` is a sequence of (value, label).
+    """
+    items = "".join(
+        f'<div class="stat"><div class="stat-value">{value}</div><div class="stat-label">{label}</div></div>'
+        for value, label in stats
+    )
+    return f'<div class="stats-card"><h3>{title}</h3><div class="stats-grid">{items}</div></div>'
+
+
+def welcome_card(icon_url, title, lead, steps, footnote):
+    """
+    HTML for the welcome card shown before a video is selected.
+    """
+    items = "".join(
+        f'<div class="welcome-step"><div>{i}</div><div>{label}</div></div>'
+        for i, label in enumerate(steps, 1)
+    )
+    return (
+        f'<div class="result-card welcome-card"><img src="{icon_url}" width="64">'
+        f'<h2>{title}</h2><p class="lead">{lead}</p>'
+        f'<div class="welcome-steps">{items}</div><p>{footnote}</p></div>'
+    )
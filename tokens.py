@@ -0,0 +1,109 @@
+"""
+Prompt size estimation and token-aware batching of subtitle lines.
+
+Calling a tokenizer service per line would cost more than the translation,
+so sizes are estimated locally: about four characters per token for
+alphabetic scripts and one token per CJK character, which is within ~15% of
+Gemini's counts on subtitles. ``pack`` uses the estimates to cut a cue list
+into consecutive batches that fill each request to `fill_ratio` of the
+model's limits (the output limit is usually the binding one, since a
+translation is longer than its source):
+
+    for start, end in pack(texts, "French", limits_for("gemini-2.0-flash")):
+        translate(texts[start:end])
+"""
+import math
+import os
+import re
+
+CHARS_PER_TOKEN = 4.0
+# CJK ideographs, kana and hangul are roughly one token per character
+CJK_RE = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]")
+# "[123] " prefix and newline around each numbered line
+LINE_OVERHEAD_TOKENS = 4
+# Instructions, glossary section and response preamble
+PROMPT_OVERHEAD_TOKENS = 300
+FILL_RATIO = float(os.getenv("BATCH_FILL_RATIO", "0.8"))
+
+
+class ModelLimits:
+    """Context window (input) and maximum response (output) size in tokens."""
+
+    def __init__(self, input_tokens, output_tokens):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+MODEL_LIMITS = {
+    "gemini-1.5-flash": ModelLimits(1_048_576, 8_192),
+    "gemini-1.5-pro": ModelLimits(2_097_152, 8_192),
+    "gemini-2.0-flash": ModelLimits(1_048_576, 8_192),
+    "gemini-2.0-flash-lite": ModelLimits(1_048_576, 8_192),
+    "gemini-2.5-flash": ModelLimits(1_048_576, 65_536),
+    "gemini-2.5-pro": ModelLimits(1_048_576, 65_536),
+}
+DEFAULT_LIMITS = ModelLimits(32_768, 8_192)
+
+# Output tokens per source (English) token, by target language
+EXPANSION = {
+    "Arabic": 1.6,
+    "Chinese (Simplified)": 1.2,
+    "Hindi": 2.2,
+    "Japanese": 1.4,
+    "Korean": 1.6,
+    "Russian": 1.6,
+}
+DEFAULT_EXPANSION = 1.3
+
+
+def limits_for(model_name):
+    for name in sorted(MODEL_LIMITS, key=len, reverse=True):
+        if model_name and model_name.startswith(name):
+            return MODEL_LIMITS[name]
+    return DEFAULT_LIMITS
+
+
+def estimate_tokens(text):
+    """Approximate token count of text."""
+    cjk = len(CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / CHARS_PER_TOKEN)
+
+
+def pack(texts, target_language, limits=DEFAULT_LIMITS, fill_ratio=FILL_RATIO, max_lines=None,
+         context_lines=0):
+    """
+    (start, end) index ranges of consecutive batches of texts. Each batch's
+    estimated prompt (plus `context_lines` neighbours on each side) and
+    response stay under `fill_ratio` of the limits, and batches are evened
+    out so the last one isn't a small remainder. A line too large on its
+    own gets a batch of its own.
+    """
+    if not texts:
+        return []
+    expansion = EXPANSION.get(target_language, DEFAULT_EXPANSION)
+    sizes = [estimate_tokens(text) + LINE_OVERHEAD_TOKENS for text in texts]
+    context = 2 * context_lines * (sum(sizes) / len(sizes))
+    budget = min(
+        limits.input_tokens * fill_ratio - PROMPT_OVERHEAD_TOKENS - context,
+        (limits.output_tokens * fill_ratio) / expansion,
+    )
+    max_lines = max_lines or len(texts)
+
+    def greedy(capacity, line_cap):
+        ranges, start, used = [], 0, 0
+        for i, size in enumerate(sizes):
+            if i > start and (used + size > capacity or i - start >= line_cap):
+                ranges.append((start, i))
+                start, used = i, 0
+            used += size
+        ranges.append((start, len(texts)))
+        return ranges
+
+    ranges = greedy(budget, max_lines)
+    if len(ranges) > 1:
+        # Same number of requests, but evenly filled
+        target = sum(sizes) / len(ranges)
+        balanced = greedy(min(budget, target * 1.05), math.ceil(len(texts) / len(ranges)))
+        if len(balanced) == len(ranges):
+            return balanced
+    return ranges
@@ -0,0 +1,274 @@
+"""
+Speech-to-text backends.
+
+Every backend implements the same ``Transcriber`` interface so the apps can
+switch engines without touching the pipeline:
+
+- ``gemini``: audio sent to Google Gemini inline or through the File API
+  depending on its size (plain text, no timings)
+- ``assemblyai``: AssemblyAI hosted transcription (segment timings)
+- ``local``: faster-whisper (CTranslate2) running int8 on the CPU, no upload
+
+Run ``python transcribers.py clip.mp3 --reference clip.txt`` to compare the
+backends head-to-head on the same clips for speed and word error rate.
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import gemini_transport
+import metrics
+from subtitles import parse_srt, segments_to_srt, text_to_segments
+
+AUDIO_MIME_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".flac": "audio/flac",
+    ".wav": "audio/wav",
+    ".m4a": "audio/mp4",
+}
+
+
+class Transcript:
+    """
+    Result of a transcription: the full text plus optional timed segments.
+    Segments are (start_seconds, end_seconds, text) tuples.
+    """
+
+    def __init__(self, text, segments=None, srt=None):
+        self.text = text
+        self.segments = segments or []
+        self._srt = srt
+
+    def timed_segments(self, duration_seconds=None):
+        """
+        Returns (start, end, text) segments, using real timings when the
+        backend provides them and approximate sentence timings otherwise.
+        """
+        if self.segments:
+            return self.segments
+        if self._srt:
+            return parse_srt(self._srt)
+        return text_to_segments(self.text, duration_seconds or 0)
+
+    def to_srt(self, duration_seconds=None):
+        """
+        Returns SRT subtitles for the transcript.
+        """
+        if self._srt:
+            return self._srt
+        return segments_to_srt(self.timed_segments(duration_seconds))
+
+
+class Transcriber:
+    """
+    Base class for speech-to-text backends.
+    """
+    name = "base"
+
+    def transcribe(self, audio_path):
+        """
+        Transcribe the audio file and return a Transcript.
+        """
+        raise NotImplementedError
+
+
+class GeminiTranscriber(Transcriber):
+    """
+    Transcribes audio with Google Gemini. Small files are sent inline, large
+    ones through the File API (see gemini_transport.py); failed requests are
+    retried with the same upload.
+    """
+    name = "gemini"
+
+    def __init__(self, model=None, model_name='gemini-2.0-flash', mime_type="audio/mpeg", retries=2):
+        self._model = model
+        self.model_name = model_name
+        self.mime_type = mime_type
+        self.retries = retries
+
+    @property
+    def model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def transcribe(self, audio_path):
+        mime_type = AUDIO_MIME_TYPES.get(os.path.splitext(audio_path)[1].lower(), self.mime_type)
+        audio_part, uploaded = gemini_transport.audio_part(audio_path, mime_type)
+        parts = [{"text": "Transcribe the audio content of this file."}, audio_part]
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.model.generate_content(parts)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    # Keep the upload so a later retry of the job can reuse it
+                    raise
+                time.sleep(2 ** attempt)
+        metrics.record_usage(self.name, response)
+        if uploaded:
+            gemini_transport.release(audio_path)
+        return Transcript(response.text)
+
+
+class AssemblyAITranscriber(Transcriber):
+    """
+    Transcribes audio with the AssemblyAI hosted API.
+    """
+    name = "assemblyai"
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or os.getenv("ASSEMBLYAI_API_KEY")
+
+    def transcribe(self, audio_path):
+        import assemblyai as aai
+        if self.api_key:
+            aai.settings.api_key = self.api_key
+
+        transcript = aai.Transcriber().transcribe(audio_path)
+        if transcript.status == aai.TranscriptStatus.error:
+            raise RuntimeError(transcript.error)
+        return Transcript(transcript.text or "", srt=transcript.export_subtitles_srt())
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """
+    Transcribes audio on the local CPU with faster-whisper in int8.
+    The model is loaded once per instance and reused across calls.
+    """
+    name = "local"
+
+    def __init__(self, model_size=None, compute_type="int8", cpu_threads=0, beam_size=1, language="en"):
+        self.model_size = model_size or os.getenv("WHISPER_MODEL", "small.en")
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or os.cpu_count() or 1
+        self.beam_size = beam_size
+        self.language = language
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from faster_whisper import WhisperModel
+            self._model = WhisperModel(
+                self.model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+            )
+        return self._model
+
+    def transcribe(self, audio_path):
+        segments, _info = self.model.transcribe(
+            audio_path,
+            language=self.language,
+            beam_size=self.beam_size,
+            vad_filter=True,
+        )
+        # faster-whisper yields segments lazily; decoding happens here
+        timed = [(s.start, s.end, s.text.strip()) for s in segments if s.text.strip()]
+        return Transcript(" ".join(t for _, _, t in timed), segments=timed)
+
+
+TRANSCRIBERS = {
+    GeminiTranscriber.name: GeminiTranscriber,
+    AssemblyAITranscriber.name: AssemblyAITranscriber,
+    LocalWhisperTranscriber.name: LocalWhisperTranscriber,
+}
+
+
+def get_transcriber(name=None, **kwargs):
+    """
+    Build a transcriber by name. Defaults to the TRANSCRIBER_BACKEND
+    environment variable, then to Gemini.
+    """
+    name = (name or os.getenv("TRANSCRIBER_BACKEND") or "gemini").lower()
+    if name not in TRANSCRIBERS:
+        raise ValueError(f"Unknown transcriber backend: {name}")
+    return TRANSCRIBERS[name](**kwargs)
+
+
+def _normalize_words(text):
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate between a reference and a hypothesis transcript
+    (word-level Levenshtein distance divided by the reference length).
+    """
+    ref = _normalize_words(reference)
+    hyp = _normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def compare_transcribers(clips, transcribers):
+    """
+    Run every transcriber on the same clips and collect speed and accuracy.
+    `clips` is a list of (audio_path, reference_text_or_None) pairs.
+    """
+    results = []
+    for transcriber in transcribers:
+        for audio_path, reference in clips:
+            start = time.perf_counter()
+            try:
+                transcript = transcriber.transcribe(audio_path)
+                error = None
+            except Exception as e:
+                transcript = None
+                error = str(e)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "backend": transcriber.name,
+                "clip": os.path.basename(audio_path),
+                "seconds": round(elapsed, 3),
+                "wer": round(word_error_rate(reference, transcript.text), 4) if transcript and reference else None,
+                "error": error,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare speech-to-text backends on the same clips.")
+    parser.add_argument("clips", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--reference", action="append", default=[],
+                        help="Reference transcript text file, one per clip in the same order")
+    parser.add_argument("--backends", default="local,gemini,assemblyai",
+                        help="Comma-separated backend names")
+    args = parser.parse_args()
+
+    references = []
+    for i in range(len(args.clips)):
+        if i < len(args.reference):
+            with open(args.reference[i], encoding="utf-8") as f:
+                references.append(f.read())
+        else:
+            references.append(None)
+
+    transcribers = [get_transcriber(name.strip()) for name in args.backends.split(",") if name.strip()]
+    results = compare_transcribers(list(zip(args.clips, references)), transcribers)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
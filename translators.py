@@ -0,0 +1,376 @@
+"""
+Translation backends.
+
+Every backend implements the same ``Translator`` interface and translates a
+batch of subtitle segments in one call:
+
+- ``gemini``: Google Gemini, numbered segments in a single prompt per batch
+- ``local``: NLLB-200 converted to CTranslate2 (int8) running on the CPU
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import profiling
+import segmentation
+import tokens
+import verification
+from glossary import load_glossary
+from subtitles import parse_srt, segments_to_srt
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+# FLORES-200 codes used by NLLB for the languages offered in the apps
+NLLB_LANGUAGE_CODES = {
+    "English": "eng_Latn",
+    "Arabic": "arb_Arab",
+    "Chinese (Simplified)": "zho_Hans",
+    "Chinese": "zho_Hans",
+    "Dutch": "nld_Latn",
+    "French": "fra_Latn",
+    "German": "deu_Latn",
+    "Hindi": "hin_Deva",
+    "Italian": "ita_Latn",
+    "Japanese": "jpn_Jpan",
+    "Korean": "kor_Hang",
+    "Portuguese": "por_Latn",
+    "Russian": "rus_Cyrl",
+    "Spanish": "spa_Latn",
+    "Swedish": "swe_Latn",
+    "Turkish": "tur_Latn",
+    "Vietnamese": "vie_Latn",
+}
+
+NUMBERED_LINE_RE = re.compile(r'^\s*\[(\d+)\]\s?(.*)$')
+
+
+class Translator:
+    """
+    Base class for translation backends.
+    """
+    name = "base"
+
+    def translate_batch(self, texts, target_language, **options):
+        """
+        Translate a list of segments and return the translations in order.
+        """
+        raise NotImplementedError
+
+    def translate_srt(self, content, target_language, **options):
+        """
+        Translate SRT content segment by segment, keeping the timings.
+        Plain text (no SRT blocks) is translated as a single segment.
+        """
+        segments = parse_srt(content)
+        if not segments:
+            return self.translate_batch([content], target_language, **options)[0]
+
+        texts = [text for _, _, text in segments]
+        translations = self.translate_batch(texts, target_language, **options)
+        # Translations are often longer than the source; re-fit them to the target language's layout
+        return segments_to_srt(segmentation.reflow(
+            [(start, end, translated) for (start, end, _), translated in zip(segments, translations)],
+            target_language,
+        ))
+
+
+class GeminiTranslator(Translator):
+    """
+    Translates batches of numbered segments with Google Gemini.
+    """
+    name = "gemini"
+
+    def __init__(self, model=None, model_name='gemini-2.0-flash', batch_size=150, temperature=0.4,
+                 context_lines=2, fill_ratio=tokens.FILL_RATIO, concurrency=1, validation_passes=1,
+                 review=False):
+        self._model = model
+        self.model_name = model_name
+        # Upper bound on lines per request; requests are otherwise packed by estimated tokens
+        self.batch_size = batch_size
+        self.temperature = temperature
+        self.context_lines = context_lines
+        self.fill_ratio = fill_ratio
+        # Requests in flight at once
+        self.concurrency = concurrency
+        # Retries of responses that lost lines or missed glossary terms
+        self.validation_passes = validation_passes
+        # Second look by the model: False, "flagged" (only lines failing the
+        # checks in verification.py) or "all"
+        self.review = review
+
+    @property
+    def model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def build_prompt(self, texts, target_language, glossary=None, before=(), after=()):
+        numbered = "\n".join(f"[{i + 1}] {text.replace(chr(10), ' ')}" for i, text in enumerate(texts))
+        # Only the terms that occur in this batch, so the prompt stays small
+        terminology = glossary.prompt_section(texts, target_language) if glossary else ""
+        if terminology:
+            terminology += "\n\n"
+        context = ""
+        if before or after:
+            context = "Neighbouring lines, for context only (do not translate or return them):\n"
+            context += "".join(f"Before: {text.replace(chr(10), ' ')}\n" for text in before)
+            context += "".join(f"After: {text.replace(chr(10), ' ')}\n" for text in after)
+            context += "\n"
+        return f"""Translate each numbered subtitle line below to {target_language} with professional, high-quality translation. Keep all numbers, punctuation, and special characters unchanged. Only translate the words. Return exactly one line per input line, keeping the [n] prefix:
+
+{terminology}{context}{numbered}
+
+Translated lines:"""
+
+    def build_review_prompt(self, texts, translations, target_language, glossary=None, issues=None):
+        issues = issues or [()] * len(texts)
+        pairs = "\n".join(
+            f"[{i + 1}] {text.replace(chr(10), ' ')} => {translation.replace(chr(10), ' ')}"
+            + (f" (check: {', '.join(line_issues)})" if line_issues else "")
+            for i, (text, translation, line_issues) in enumerate(zip(texts, translations, issues))
+        )
+        terminology = glossary.prompt_section(texts, target_language) if glossary else ""
+        if terminology:
+            terminology += "\n\n"
+        return f"""Each numbered line below is a subtitle followed by its {target_language} translation ("source => translation"). Correct mistranslations, omissions and unnatural phrasing. Keep all numbers, punctuation, and special characters unchanged. Return exactly one corrected {target_language} line per input line, keeping the [n] prefix:
+
+{terminology}{pairs}
+
+Corrected lines:"""
+
+    def _request(self, prompt, expected, generation_config):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            safety_settings=SAFETY_SETTINGS
+        )
+        metrics.record_usage(self.name, response)
+        return parse_numbered_lines(response.text, expected)
+
+    def _generate(self, texts, target_language, generation_config, glossary, before=(), after=()):
+        return self._request(
+            self.build_prompt(texts, target_language, glossary, before, after), len(texts), generation_config
+        )
+
+    def review_batch(self, texts, translations, target_language, generation_config, glossary=None, issues=None):
+        """Corrected translations of texts, from a second look by the model."""
+        return self._request(
+            self.build_review_prompt(texts, translations, target_language, glossary, issues),
+            len(texts), generation_config
+        )
+
+    def _review_flagged(self, texts, translations, target_language, generation_config, glossary):
+        """
+        Send only the lines that fail the cheap checks back for review, in
+        one small request, and keep a revision only if it fails fewer checks.
+        """
+        flagged = verification.flag_cues(texts, translations, target_language)
+        metrics.CUE_CHECKS.inc(len(texts) - len(flagged), result="ok")
+        if not flagged:
+            return translations
+        indices = sorted(flagged)
+        try:
+            revised = self.review_batch(
+                [texts[i] for i in indices], [translations[i] for i in indices], target_language,
+                generation_config, glossary, issues=[flagged[i] for i in indices],
+            )
+        except ValueError:
+            metrics.CUE_CHECKS.inc(len(indices), result="flagged")
+            return translations
+        for position, i in enumerate(indices):
+            if len(verification.check_cue(texts[i], revised[position], target_language)) < len(flagged[i]):
+                translations[i] = revised[position]
+                metrics.CUE_CHECKS.inc(result="fixed")
+            else:
+                metrics.CUE_CHECKS.inc(result="flagged")
+        return translations
+
+    def _enforce_glossary(self, texts, translations, target_language, generation_config, glossary):
+        """
+        Re-translate, in one small request per pass, only the lines that
+        missed a required term; keep whichever version satisfies the glossary.
+        """
+        bad = sorted(glossary.violations(texts, translations, target_language))
+        metrics.GLOSSARY_CHECKS.inc(len(texts) - len(bad), result="ok")
+        for _ in range(self.validation_passes):
+            if not bad:
+                break
+            try:
+                retried = self._generate([texts[i] for i in bad], target_language, generation_config, glossary)
+            except ValueError:
+                break
+            still_bad = glossary.violations([texts[i] for i in bad], retried, target_language)
+            for position, i in enumerate(bad):
+                if position not in still_bad:
+                    translations[i] = retried[position]
+                    metrics.GLOSSARY_CHECKS.inc(result="fixed")
+            bad = [bad[position] for position in sorted(still_bad)]
+        metrics.GLOSSARY_CHECKS.inc(len(bad), result="violation")
+        return translations
+
+    def _translate_packed(self, texts, start, end, target_language, generation_config, glossary):
+        batch = texts[start:end]
+        context = {
+            "before": texts[max(0, start - self.context_lines):start],
+            "after": texts[end:end + self.context_lines],
+        }
+        for attempt in range(self.validation_passes + 1):
+            try:
+                translations = self._generate(batch, target_language, generation_config, glossary, **context)
+                break
+            except ValueError:
+                # The response dropped or merged lines; ask again
+                if attempt == self.validation_passes:
+                    raise
+        if self.review == "flagged":
+            translations = self._review_flagged(batch, translations, target_language, generation_config, glossary)
+        elif self.review:
+            try:
+                translations = self.review_batch(batch, translations, target_language, generation_config, glossary)
+            except ValueError:
+                pass
+        if glossary and self.validation_passes:
+            translations = self._enforce_glossary(batch, translations, target_language, generation_config, glossary)
+        return translations
+
+    def translate_batch(self, texts, target_language, temperature=None, glossary=None, **options):
+        """
+        `glossary` (default: load_glossary()) adds the terms each batch uses
+        to its prompt; lines that still miss a term are retried up to
+        validation_passes times. Up to `concurrency` requests run at once.
+        """
+        import google.generativeai as genai
+
+        generation_config = genai.GenerationConfig(
+            temperature=self.temperature if temperature is None else temperature,
+            top_p=1,
+            top_k=1,)
+        glossary = load_glossary() if glossary is None else glossary
+
+        batches = tokens.pack(
+            texts, target_language, tokens.limits_for(self.model_name), fill_ratio=self.fill_ratio,
+            max_lines=self.batch_size, context_lines=self.context_lines,
+        )
+
+        def translate(bounds):
+            return self._translate_packed(texts, *bounds, target_language, generation_config, glossary)
+
+        if self.concurrency > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+                results = list(pool.map(profiling.propagate(translate), batches))
+        else:
+            results = [translate(bounds) for bounds in batches]
+        return [translation for batch in results for translation in batch]
+
+
+def parse_numbered_lines(text, expected):
+    """
+    Parses "[n] text" lines from a model response into a list of `expected`
+    translations. Raises ValueError if any line is missing.
+    """
+    lines = {}
+    for line in text.splitlines():
+        match = NUMBERED_LINE_RE.match(line)
+        if match:
+            lines[int(match.group(1))] = match.group(2).strip()
+
+    missing = [i for i in range(1, expected + 1) if i not in lines]
+    if missing:
+        raise ValueError(f"Translation response is missing lines: {missing[:10]}")
+    return [lines[i] for i in range(1, expected + 1)]
+
+
+class LocalNLLBTranslator(Translator):
+    """
+    Translates on the local CPU with an NLLB-200 model converted to
+    CTranslate2 (e.g. ``ct2-transformers-converter --quantization int8``).
+
+    Segments are handed to CTranslate2 in a single call with token-based
+    batching: inputs are sorted by length and packed into batches of at most
+    `max_batch_tokens` tokens, and `inter_threads` batches run in parallel.
+    """
+    name = "local"
+
+    def __init__(self, model_path=None, tokenizer_name=None, source_language="English",
+                 max_batch_tokens=2048, inter_threads=None, intra_threads=1, beam_size=2):
+        self.model_path = model_path or os.getenv("NLLB_MODEL_PATH", "nllb-200-distilled-600M-ct2-int8")
+        self.tokenizer_name = tokenizer_name or os.getenv("NLLB_TOKENIZER", "facebook/nllb-200-distilled-600M")
+        self.source_language = source_language
+        self.max_batch_tokens = max_batch_tokens
+        self.inter_threads = inter_threads or os.cpu_count() or 1
+        self.intra_threads = intra_threads
+        self.beam_size = beam_size
+        self._translator = None
+        self._tokenizer = None
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            import ctranslate2
+            self._translator = ctranslate2.Translator(
+                self.model_path,
+                device="cpu",
+                compute_type="int8",
+                inter_threads=self.inter_threads,
+                intra_threads=self.intra_threads,
+            )
+        return self._translator
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(
+                self.tokenizer_name, src_lang=NLLB_LANGUAGE_CODES[self.source_language]
+            )
+        return self._tokenizer
+
+    def translate_batch(self, texts, target_language, **options):
+        if target_language not in NLLB_LANGUAGE_CODES:
+            raise ValueError(f"Unsupported target language for local translation: {target_language}")
+        target_code = NLLB_LANGUAGE_CODES[target_language]
+
+        sources = [
+            self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text.replace("\n", " ")))
+            for text in texts
+        ]
+        results = self.translator.translate_batch(
+            sources,
+            target_prefix=[[target_code]] * len(sources),
+            max_batch_size=self.max_batch_tokens,
+            batch_type="tokens",
+            beam_size=self.beam_size,
+        )
+
+        translations = []
+        for result in results:
+            hypothesis = result.hypotheses[0][1:]  # Drop the target language token
+            translations.append(
+                self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(hypothesis), skip_special_tokens=True)
+            )
+        return translations
+
+
+TRANSLATORS = {
+    GeminiTranslator.name: GeminiTranslator,
+    LocalNLLBTranslator.name: LocalNLLBTranslator,
+}
+
+
+def get_translator(name=None, **kwargs):
+    """
+    Build a translator by name. Defaults to the TRANSLATOR_BACKEND
+    environment variable, then to Gemini.
+    """
+    name = (name or os.getenv("TRANSLATOR_BACKEND") or "gemini").lower()
+    if name not in TRANSLATORS:
+        raise ValueError(f"Unknown translator backend: {name}")
+    return TRANSLATORS[name](**kwargs)
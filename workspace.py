@@ -0,0 +1,165 @@
+"""
+Per-job scratch workspaces with guaranteed cleanup and bounded disk usage.
+
+    with Workspace() as ws:
+        video_path = ws.write_upload(uploaded_file, "input.mp4")
+        ...                                  # everything lives under ws.path
+
+The directory is removed when the block exits, including on errors and on
+st.stop(). Each workspace has a size quota, the scratch root has a global
+quota, and a background janitor deletes workspaces abandoned by crashed or
+killed processes. The API applies the same age and quota rules to its job
+directories (see api.py).
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import metrics
+import resources
+
+SCRATCH_ROOT = os.getenv("SCRATCH_DIR", os.path.join(tempfile.gettempdir(), "deepvideotranslator"))
+WORKSPACE_QUOTA_BYTES = int(os.getenv("WORKSPACE_QUOTA_BYTES", str(4 * 1024 ** 3)))
+SCRATCH_QUOTA_BYTES = int(os.getenv("SCRATCH_QUOTA_BYTES", str(20 * 1024 ** 3)))
+STALE_SECONDS = int(os.getenv("WORKSPACE_STALE_SECONDS", str(6 * 3600)))
+JANITOR_INTERVAL_SECONDS = int(os.getenv("WORKSPACE_JANITOR_INTERVAL", "600"))
+
+WORKSPACE_PREFIX = "ws-"
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class QuotaExceeded(Exception):
+    """Writing more data would exceed a workspace or scratch disk quota."""
+
+
+def disk_usage(path):
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def sweep_stale(root=SCRATCH_ROOT, max_age=STALE_SECONDS, prefix=WORKSPACE_PREFIX, in_use=None):
+    """
+    Remove the directories under root named with `prefix` whose last
+    activity is older than max_age seconds, except those for which
+    `in_use(name)` is true. Returns the number of directories removed.
+    """
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if not name.startswith(prefix) or not os.path.isdir(path) or (in_use and in_use(name)):
+            continue
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def ensure_capacity(needed_bytes=0, root=SCRATCH_ROOT, quota=SCRATCH_QUOTA_BYTES, max_age=STALE_SECONDS,
+                    prefix=WORKSPACE_PREFIX, in_use=None):
+    """
+    Raise QuotaExceeded if the scratch root can't take needed_bytes more,
+    after first sweeping stale directories (see sweep_stale).
+    """
+    if disk_usage(root) + needed_bytes <= quota:
+        return
+    sweep_stale(root, max_age, prefix, in_use)
+    if disk_usage(root) + needed_bytes > quota:
+        raise QuotaExceeded("Scratch disk quota exceeded; try again later.")
+
+
+@resources.resource
+def start_janitor(root=SCRATCH_ROOT, interval=JANITOR_INTERVAL_SECONDS, max_age=STALE_SECONDS,
+                  prefix=WORKSPACE_PREFIX, in_use=None):
+    """
+    Start the background janitor for root (once per process).
+    """
+    def run():
+        while True:
+            sweep_stale(root, max_age, prefix, in_use)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="workspace-janitor", daemon=True)
+    thread.start()
+    return thread
+
+
+class Workspace:
+    """
+    Private scratch directory for one job, removed on exit.
+    """
+
+    def __init__(self, root=SCRATCH_ROOT, quota_bytes=WORKSPACE_QUOTA_BYTES):
+        os.makedirs(root, exist_ok=True)
+        start_janitor(root)
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.path = tempfile.mkdtemp(prefix=WORKSPACE_PREFIX, dir=root)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def file(self, name):
+        """Path for a file inside the workspace (directory parts are dropped)."""
+        self.touch()
+        return os.path.join(self.path, os.path.basename(name))
+
+    def touch(self):
+        """Mark the workspace as active so the janitor leaves it alone."""
+        os.utime(self.path)
+
+    def check_quota(self, extra_bytes=0):
+        if disk_usage(self.path) + extra_bytes > self.quota_bytes:
+            raise QuotaExceeded("This video needs more scratch space than allowed.")
+
+    def write_upload(self, source, name):
+        """
+        Copy an uploaded file (bytes or a file-like object) into the
+        workspace in chunks, enforcing the quotas. Returns the new path.
+        """
+        if isinstance(source, (bytes, bytearray)):
+            size = len(source)
+        else:
+            size = getattr(source, "size", 0) or 0
+        self.check_quota(size)
+        ensure_capacity(size, self.root)
+
+        path = self.file(name)
+        written = disk_usage(self.path)
+        with open(path, "wb") as f:
+            if isinstance(source, (bytes, bytearray)):
+                f.write(source)
+            else:
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                while True:
+                    chunk = source.read(COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > self.quota_bytes:
+                        raise QuotaExceeded("This video needs more scratch space than allowed.")
+                    f.write(chunk)
+        metrics.TRANSFER_BYTES.inc(os.path.getsize(path), direction="in", channel="app_upload")
+        return path
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)